@@ -1,24 +1,41 @@
-from flask import Flask, request, jsonify, send_file, render_template_string
+from flask import Flask, Request, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 import os
 import tempfile
 import zipfile
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-from agent import research_agent
+from paper_agent import research_agent, read_artifact_manifest, source_prefix
+import stacks
+from generation_cache import generation_cache, LRUCache
+from blob_store import BlobStore, file_digest
+from publishing import publish
+from validation import file_validator
+from archive import ARCHIVE_FORMATS, available_formats, stream_tar
+from garbage_collector import ArtifactCollector, mark_used
+from jobs import JobQueue, QueueFull, process_alive
+from upload_store import ResumableUploads, UploadStore
 import json
 import subprocess
-import shutil
 import time
 import threading
 import sys
 
+class UploadRequest(Request):
+    """Request whose uploaded files stream into the upload store's spool, hashed as they arrive"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return upload_store.spool()
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app)
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
-MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+# Uploads are streamed to disk, so memory use does not grow with this limit
+MAX_CONTENT_LENGTH = int(os.environ.get('UPLOAD_MAX_MB', 512)) * 1024 * 1024
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
@@ -27,9 +44,86 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(os.path.join(UPLOAD_FOLDER, 'previews'), exist_ok=True)
 
+# Uploaded PDFs are kept once per content hash; up to UPLOAD_SPOOL_MB of each is held in memory
+upload_store = UploadStore(os.path.join(UPLOAD_FOLDER, 'pdfs'),
+                           spool_bytes=int(os.environ.get('UPLOAD_SPOOL_MB', 16)) * 1024 * 1024)
+# Large uploads may instead arrive in UPLOAD_CHUNK_MB chunks, so a dropped connection costs one chunk
+resumable_uploads = ResumableUploads(os.path.join(UPLOAD_FOLDER, 'partial'),
+                                     chunk_bytes=int(os.environ.get('UPLOAD_CHUNK_MB', 4)) * 1024 * 1024)
+
+# Generated files are kept once per content hash; previews and extractions link to them
+blob_store = BlobStore(os.path.join(UPLOAD_FOLDER, 'blobs'))
+
+# Store running applications
+running_apps = {}
+# Each running app is also recorded here, so a collector in another server process keeps its files
+RUNNING_FOLDER = os.path.join(UPLOAD_FOLDER, 'running')
+
+# Uploads are processed off the request thread; at most JOB_QUEUE_SIZE wait or run at once.
+# Job state is kept on disk so any server process can report on any job
+job_queue = JobQueue(max_workers=int(os.environ.get('JOB_WORKERS', 0)) or min(4, os.cpu_count() or 1),
+                     max_pending=int(os.environ.get('JOB_QUEUE_SIZE', 32)),
+                     state_dir=os.path.join(UPLOAD_FOLDER, 'jobs'),
+                     max_age=int(os.environ.get('JOB_STATE_TTL', 24 * 60 * 60)))
+
+def record_running_app(project_name, running_info):
+    running_apps[project_name] = running_info
+    marker = {'pid': os.getpid(), 'zip_path': os.path.abspath(running_info['zip_path']),
+              'extract_dir': os.path.abspath(running_info['extract_dir'])}
+    os.makedirs(RUNNING_FOLDER, exist_ok=True)
+    with publish(os.path.join(RUNNING_FOLDER, f'{project_name}.json')) as temp_path:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(marker, f)
+
+def protected_paths():
+    """Paths the collector must keep: running apps' archives and directories, PDFs of unfinished jobs"""
+    paths = [path for info in list(running_apps.values()) for path in (info['zip_path'], info['extract_dir'])]
+    if os.path.isdir(RUNNING_FOLDER):
+        for name in os.listdir(RUNNING_FOLDER):
+            try:
+                with open(os.path.join(RUNNING_FOLDER, name), 'r', encoding='utf-8') as f:
+                    marker = json.load(f)
+            except (OSError, ValueError):
+                continue
+            # Apps die with the server process that started them
+            if process_alive(marker['pid']):
+                paths.extend((marker['zip_path'], marker['extract_dir']))
+    paths.extend(job.args[0] for job in job_queue.stored() if job.kind == 'upload' and job.finished_at is None)
+    return paths
+
+# Unused artifacts are evicted by TTL (seconds since last use) and, over the disk quota, LRU first
+collector = ArtifactCollector(
+    UPLOAD_FOLDER, blob_store,
+    ttls={kind: int(os.environ[f'GC_TTL_{kind.upper()}'])
+          for kind in ('uploads', 'archives', 'previews', 'extracted', 'partial')
+          if f'GC_TTL_{kind.upper()}' in os.environ},
+    quota_bytes=int(os.environ.get('GC_DISK_QUOTA', 5 * 1024 * 1024 * 1024)),
+    grace=int(os.environ.get('GC_GRACE', 600)),
+    protected=protected_paths
+)
+
+def start_collector():
+    """Start collecting every GC_INTERVAL seconds in this process; call it in each server process after forking
+
+    A lock on uploads/.gc.lock picks the one process that actually collects.
+    """
+    collector.start(int(os.environ.get('GC_INTERVAL', 600)), os.path.join(UPLOAD_FOLDER, '.gc.lock'))
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def requested_technologies(form):
+    """Return the stacks for a fan-out upload, or None for a single-stack upload
+
+    `technology=all` selects every enabled stack; `technologies` takes a comma separated
+    list (or repeated fields) of stack names.
+    """
+    if form.get('technology', '').lower() == 'all':
+        return [stack['id'] for stack in stacks.available_stacks()]
+    names = [name.strip() for value in form.getlist('technologies') for name in value.split(',')]
+    names = [name for name in names if name]
+    return names or None
+
 @app.route('/')
 def index():
     """Serve the main web interface"""
@@ -42,12 +136,16 @@ def health_check():
 
 @app.route('/api/upload', methods=['POST'])
 def upload_pdf():
+    """Store the PDF and queue its processing; returns 202 with a job id to poll at /api/jobs/<id>
+
+    The file is hashed while it is received and stored under its SHA-256, so uploading the
+    same PDF again writes nothing new.
+    """
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
         
         file = request.files['file']
-        technology = request.form.get('technology', 'MERN Stack')
         
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
@@ -55,64 +153,440 @@ def upload_pdf():
         if not allowed_file(file.filename):
             return jsonify({'error': 'Only PDF files are allowed'}), 400
         
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        options, error = upload_options(request.form)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Process the PDF
-        content = research_agent.extract_pdf_content(file_path)
+        # The stored PDF is named by its hash; the project is named after the uploaded file
+        project_name = os.path.splitext(secure_filename(file.filename))[0]
+        upload = file.stream
         
-        if content.startswith("Error"):
-            return jsonify({'error': f'Error extracting PDF: {content}'}), 400
+        if not options['stream']:
+            def store():
+                file_path, digest, duplicate = upload_store.commit(upload)
+                return {'bytes': upload.size, 'sha256': digest, 'duplicate': duplicate}
+            return queue_upload(upload_store.path(upload.hexdigest()), project_name, options, store)
         
-        # Analyze content and generate structure
-        project_structure, concepts = research_agent.analyze_content_and_generate_structure(content)
+        # On-demand download: the archive is generated as the client reads it and never stored,
+        # so the response itself is the result and there is no job
+        file_path, digest, duplicate = upload_store.commit(upload)
+        payload, status = analyse_upload(file_path)
+        if status != 200:
+            return jsonify(payload), status
+        technology, archive_format = options['technology'], options['archive_format']
+        download_name = project_name + ARCHIVE_FORMATS[archive_format]['extension']
+        return Response(
+            stream_with_context(research_agent.stream_artifact(payload['concepts'], project_name, technology, archive_format)),
+            mimetype=ARCHIVE_FORMATS[archive_format]['mimetype'],
+            headers={'Content-Disposition': f'attachment; filename="{download_name}"'}
+        )
         
-        # Generate code with specified technology
-        # Use the PDF filename (without extension) as the project and ZIP name
-        pdf_basename = os.path.splitext(filename)[0]  # Remove .pdf extension
-        project_name = pdf_basename
-        generated_code = research_agent.generate_code_for_technology(concepts, project_name, technology)
+    except RequestEntityTooLarge:
+        return jsonify({'error': f'File too large; the limit is {MAX_CONTENT_LENGTH // (1024 * 1024)} MB'}), 413
+    except Exception as e:
+        return jsonify({'error': f'Processing error: {str(e)}'}), 500
+
+def upload_options(form):
+    """Read an upload's generation options from its form; returns (options, None) or (None, error)"""
+    technologies = requested_technologies(form)
+    stream = form.get('delivery') == 'stream'
+    if stream and technologies:
+        return None, 'Streamed delivery generates a single stack'
+    
+    archive_format = form.get('format', 'zip')
+    if archive_format not in available_formats():
+        return None, f"Unsupported format; choose one of: {', '.join(available_formats())}"
+    return {'technology': form.get('technology', 'MERN Stack'), 'technologies': technologies,
+            'archive_format': archive_format, 'stream': stream}, None
+
+def queue_upload(file_path, project_name, options, store):
+    """Queue the processing of an upload whose PDF store() puts at file_path; returns the 202 response
+
+    The job is created first so storing is its first timed stage, and a full queue rejects the
+    upload (503) before anything is stored. store() returns the details of the 'save' event.
+    """
+    try:
+        job = job_queue.create('upload', file_path, project_name, options['technology'], options['technologies'],
+                               options['archive_format'])
+    except QueueFull as e:
+        return jsonify({'error': f'Server busy, try again shortly: {str(e)}'}), 503
+    try:
+        job.progress('save', 'started')
+        details = store()
+        job.progress('save', 'finished', **details)
+    except Exception as e:
+        job_queue.abandon(job, f'Error saving upload: {str(e)}')
+        raise
+    job_queue.start(job, process_upload)
+    
+    response = jsonify(dict(details, job_id=job.id, status=job.status, status_url=f'/api/jobs/{job.id}',
+                            events_url=f'/api/jobs/{job.id}/events'))
+    response.status_code = 202
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    return response
+
+def ignore_progress(stage, state, **details):
+    pass
+
+def analyse_upload(file_path, progress=ignore_progress):
+    """Extract and analyse a saved PDF; returns ({'content', 'concepts'}, 200) or (error, status)
+
+    Stored PDFs are named by content, so text extracted once is reused for every later upload
+    of the same file.
+    """
+    progress('extract', 'started')
+    content = upload_store.read_text(file_path)
+    if content is not None:
+        progress('extract', 'finished', characters=len(content), cached=True)
+    else:
+        content = research_agent.extract_pdf_content(
+            file_path, on_page=lambda done, total: progress('extract', 'progress', pages_done=done, pages_total=total))
         
+        if content.startswith("Error"):
+            progress('extract', 'failed')
+            return {'error': f'Error extracting PDF: {content}'}, 400
+        upload_store.write_text(file_path, content)
+        progress('extract', 'finished', characters=len(content))
+    
+    # Analyze content and generate structure
+    progress('analyse', 'started')
+    project_structure, concepts = research_agent.analyze_content_and_generate_structure(content)
+    progress('analyse', 'finished', features=len(concepts['features']))
+    return {'content': content, 'concepts': concepts}, 200
+
+def process_upload(file_path, project_name, technology, technologies, archive_format, progress=ignore_progress):
+    """Job body of /api/upload: analyse the PDF and build its artifacts; returns (payload, status)"""
+    analysis, status = analyse_upload(file_path, progress)
+    if status != 200:
+        return analysis, status
+    content, concepts = analysis['content'], analysis['concepts']
+    
+    # Generate code with specified technology
+    # The uploaded PDF's filename (without extension) is the project name. Archives are named
+    # <project>-<PDF hash prefix>-<stack>, so concurrent jobs for different PDFs with the same
+    # filename never publish over each other
+    uploads_dir = app.config['UPLOAD_FOLDER']
+    prefix = source_prefix(project_name, upload_store.digest(file_path))
+    
+    if technologies:
+        # Fan-out mode: one analysis, one ZIP per requested stack (on FANOUT_WORKERS threads)
+        artifacts = research_agent.build_artifacts(concepts, project_name, technologies, uploads_dir,
+                                                   store=blob_store, archive_format=archive_format,
+                                                   progress=progress, artifact_prefix=prefix)
+        failed = [artifact for artifact in artifacts if 'error' in artifact]
+        if len(failed) == len(artifacts):
+            return {'error': f"Error creating ZIP files: {failed[0]['error']}", 'artifacts': artifacts}, 500
+        artifact = next(artifact for artifact in artifacts if 'error' not in artifact)
+    else:
         # Create ZIP file in uploads directory for easier access
-        uploads_dir = app.config['UPLOAD_FOLDER']
-        research_agent.generated_code = generated_code
-        zip_path = research_agent.create_zip_file(project_name, uploads_dir)
+        artifacts = None
+        artifact = research_agent.build_artifact(concepts, project_name, technology, uploads_dir,
+                                                 f"{prefix}-{stacks.stack_key(technology)}",
+                                                 store=blob_store, archive_format=archive_format,
+                                                 progress=progress)
+        if 'error' in artifact:
+            return {'error': f"Error creating ZIP file: {artifact['error']}"}, 500
+    
+    # The uploaded file is kept for download/preview; the collector evicts it once unused
+    
+    # Return analysis results and ZIP file info
+    return {
+        'success': True,
+        'analysis': {
+            'keywords': concepts['keywords'][:10],
+            'technical_terms': concepts['technical_terms'],
+            'features': concepts['features'],
+            'abstract': content[:800] + "..." if len(content) > 800 else content
+        },
+        'project_structure': artifact['project_structure'],
+        'zip_filename': artifact['zip_filename'],
+        'zip_path': artifact['zip_path'],
+        'stats': artifact['stats'],
+        'technology': artifact['technology'] if technologies else technology,
+        'artifacts': artifacts
+    }, 200
+
+@app.route('/api/upload/by-hash', methods=['POST'])
+def upload_by_hash():
+    """Queue a PDF the server already stores, given its `sha256`, without the file being sent again
+
+    Takes the form fields of /api/upload plus `sha256` and `filename` (which names the project),
+    and answers like it. Content the server does not have gets a 404, and the client uploads
+    the file as usual.
+    """
+    try:
+        filename = request.form.get('filename', '')
+        if not allowed_file(filename):
+            return jsonify({'error': 'Only PDF files are allowed'}), 400
         
-        if zip_path.startswith("Error"):
-            return jsonify({'error': f'Error creating ZIP file: {zip_path}'}), 500
+        options, error = upload_options(request.form)
+        if error:
+            return jsonify({'error': error}), 400
+        if options['stream']:
+            return jsonify({'error': 'Uploads by hash are processed as jobs; use /api/upload for streamed delivery'}), 400
         
-        # Clean up uploaded file (keep it for download/preview)
-        # os.remove(file_path)  # Commented out to keep the file for download
+        sha256 = request.form.get('sha256', '').lower()
+        file_path = upload_store.find(sha256)
+        if file_path is None:
+            return jsonify({'error': 'File not stored; upload it', 'upload_url': '/api/upload'}), 404
         
-        # Return analysis results and ZIP file info
-        return jsonify({
-            'success': True,
-            'analysis': {
-                'keywords': concepts['keywords'][:10],
-                'technical_terms': concepts['technical_terms'],
-                'features': concepts['features'],
-                'abstract': content[:800] + "..." if len(content) > 800 else content
-            },
-            'project_structure': list(generated_code.keys()),
-            'zip_filename': os.path.basename(zip_path),
-            'zip_path': zip_path,
-            'technology': technology
-        })
+        return queue_upload(file_path, os.path.splitext(secure_filename(filename))[0], options,
+                            lambda: {'bytes': 0, 'sha256': sha256, 'duplicate': True})
+    
+    except Exception as e:
+        return jsonify({'error': f'Processing error: {str(e)}'}), 500
+
+def resumable_status(upload):
+    return dict(upload, upload_url=f"/api/uploads/{upload['id']}", finalize_url=f"/api/uploads/{upload['id']}/finalize")
+
+@app.route('/api/uploads', methods=['POST'])
+def start_resumable_upload():
+    """Start a chunked upload of {filename, size}; returns its id, chunk size and the chunk offsets to send"""
+    data = request.get_json(silent=True) or {}
+    filename = data.get('filename') or ''
+    size = data.get('size')
+    
+    if not allowed_file(filename):
+        return jsonify({'error': 'Only PDF files are allowed'}), 400
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        return jsonify({'error': 'size must be the file size in bytes'}), 400
+    if size > MAX_CONTENT_LENGTH:
+        return jsonify({'error': f'File too large; the limit is {MAX_CONTENT_LENGTH // (1024 * 1024)} MB'}), 413
+    
+    upload = resumable_uploads.create(secure_filename(filename), size)
+    response = jsonify(resumable_status(upload))
+    response.status_code = 201
+    response.headers['Location'] = f"/api/uploads/{upload['id']}"
+    return response
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def resumable_upload_status(upload_id):
+    """Report which chunks of an upload have arrived, so a client can resume where it stopped"""
+    upload = resumable_uploads.get(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify(resumable_status(upload))
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    """Write the chunk in the request body at the `offset` query parameter
+
+    An `X-Chunk-SHA256` header is checked against the chunk's bytes; a mismatch answers 400
+    and the chunk has to be sent again.
+    """
+    upload = resumable_uploads.get(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    try:
+        upload = resumable_uploads.write_chunk(upload, request.args.get('offset', type=int), request.stream,
+                                               request.content_length, request.headers.get('X-Chunk-SHA256'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(resumable_status(upload))
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+def cancel_upload(upload_id):
+    if resumable_uploads.get(upload_id) is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    resumable_uploads.remove(upload_id)
+    return jsonify({'success': True})
+
+@app.route('/api/uploads/<upload_id>/finalize', methods=['POST'])
+def finalize_upload(upload_id):
+    """Check a complete chunked upload against the `sha256` it was sent with, if any, and queue it like /api/upload
+
+    Takes the same form fields as /api/upload, except that results are always delivered as a job.
+    """
+    try:
+        upload = resumable_uploads.get(upload_id)
+        if upload is None:
+            return jsonify({'error': 'Upload not found'}), 404
+        if upload['missing']:
+            return jsonify(dict(resumable_status(upload), error=f"{len(upload['missing'])} chunk(s) still missing")), 409
+        
+        options, error = upload_options(request.form)
+        if error:
+            return jsonify({'error': error}), 400
+        if options['stream']:
+            return jsonify({'error': 'Chunked uploads are processed as jobs; use /api/upload for streamed delivery'}), 400
         
+        try:
+            data_path, sha256 = resumable_uploads.complete(upload, request.form.get('sha256'))
+        except ValueError as e:
+            # The upload is discarded; the client has to send the file again
+            return jsonify({'error': str(e)}), 400
+        
+        def store():
+            file_path, digest, duplicate = upload_store.add(data_path, sha256)
+            resumable_uploads.remove(upload_id)
+            return {'bytes': upload['size'], 'sha256': digest, 'duplicate': duplicate}
+        return queue_upload(upload_store.path(sha256), os.path.splitext(upload['filename'])[0], options, store)
+    
     except Exception as e:
         return jsonify({'error': f'Processing error: {str(e)}'}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status of a queued job; `result` holds the upload response once it has succeeded"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Server-Sent Events for a job: a `progress` event per stage change, then one `done` event
+
+    Each `progress` event holds the stage (save, extract, analyse, generate, zip), its state,
+    `elapsed_ms` since the upload and, once finished, `stage_ms`; extract reports pages done and
+    total as it goes. `done` holds the same body as /api/jobs/<id>. Reconnecting clients resume
+    after the Last-Event-ID they send.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    try:
+        since = int(request.headers.get('Last-Event-ID', -1)) + 1
+    except ValueError:
+        since = 0
+    
+    def events(since):
+        idle = 0
+        job = job_queue.get(job_id)
+        while job is not None:
+            # A job run by another server process is followed by re-reading its state file
+            timeout = 15 if job.live else 1
+            batch = job.wait_events(since, timeout=timeout)
+            if not batch:
+                idle += timeout
+                if idle >= 15:
+                    # Comment lines keep proxies from closing an idle stream
+                    idle = 0
+                    yield ': keep-alive\n\n'
+                if not job.live:
+                    job = job_queue.get(job_id)
+                continue
+            idle = 0
+            for event in batch:
+                if event['stage'] == 'job':
+                    yield f"id: {event['seq']}\nevent: done\ndata: {json.dumps(job.to_dict())}\n\n"
+                    return
+                yield f"id: {event['seq']}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+            since = batch[-1]['seq'] + 1
+    
+    return Response(stream_with_context(events(since)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Recent jobs without their results, plus queue occupancy"""
+    jobs = [{key: value for key, value in job.to_dict().items() if key != 'result'}
+            for job in sorted(job_queue.stored(), key=lambda job: job.created_at)]
+    return jsonify(dict(job_queue.stats(), recent=jobs))
+
+@app.route('/api/regenerate/<filename>', methods=['POST'])
+def regenerate_zip(filename):
+    """Rename the project or change its features without regenerating the whole artifact"""
+    try:
+        zip_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(filename))
+        if not os.path.exists(zip_path):
+            return jsonify({'error': 'File not found'}), 404
+        rejected = not_a_zip(zip_path, 'Regenerate')
+        if rejected:
+            return rejected
+        mark_used(zip_path)
+        
+        payload = request.get_json(silent=True) or request.form
+        
+        def as_list(value):
+            if value is None or isinstance(value, list):
+                return value
+            return [item.strip() for item in value.split(',') if item.strip()]
+        
+        project_name = payload.get('project_name')
+        result = research_agent.regenerate_artifact(
+            zip_path,
+            project_name=secure_filename(project_name) if project_name else None,
+            features=as_list(payload.get('features')),
+            keywords=as_list(payload.get('keywords'))
+        )
+        if 'error' in result:
+            # A conflict is a request to overwrite a different artifact
+            return jsonify(result), 409 if result.pop('conflict', False) else 400
+        
+        return jsonify(dict(result, success=True))
+        
+    except Exception as e:
+        return jsonify({'error': f'Regeneration error: {str(e)}'}), 500
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Report generation and ZIP cache usage and hit ratios, blob store size, validation verdicts and GC runs"""
+    return jsonify(dict(generation_cache.stats(), blobs=blob_store.stats(), validation=file_validator.stats(),
+                        gc=collector.stats(), jobs=job_queue.stats()))
+
+@app.route('/api/gc', methods=['POST'])
+def collect_garbage():
+    """Run the artifact collector now and report what it removed and the bytes reclaimed"""
+    try:
+        return jsonify(collector.collect())
+    except Exception as e:
+        return jsonify({'error': f'Garbage collection error: {str(e)}'}), 500
+
+# (path, size, mtime) -> SHA-256, so repeat downloads of an unchanged ZIP are not re-hashed
+zip_digests = LRUCache(max_entries=1024, max_bytes=1024 * 1024)
+
+def content_etag(path):
+    """Strong ETag for a file, derived from its contents"""
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = zip_digests.get(key)
+    if digest is None:
+        digest = file_digest(path)
+        zip_digests.put(key, digest, len(digest))
+    return digest
+
+def converted_download(zip_path, filename, archive_format):
+    """Stream a stored ZIP re-packed as a solid tarball"""
+    # ZIPs are reproducible and so is the conversion, so the ETag can stay strong
+    etag = f"{content_etag(zip_path)}.{archive_format}"
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    
+    def members():
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield info.filename, archive.read(info)
+    
+    download_name = os.path.splitext(filename)[0] + ARCHIVE_FORMATS[archive_format]['extension']
+    response = Response(
+        stream_with_context(stream_tar(members(), archive_format)),
+        mimetype=ARCHIVE_FORMATS[archive_format]['mimetype'],
+        headers={'Content-Disposition': f'attachment; filename="{download_name}"'}
+    )
+    response.set_etag(etag)
+    return response
+
 @app.route('/api/download/<filename>')
 def download_zip(filename):
     try:
+        archive_format = request.args.get('format')
+        if archive_format is not None and archive_format not in available_formats():
+            return jsonify({'error': f"Unsupported format; choose one of: {', '.join(available_formats())}"}), 400
+        
         # Look for ZIP file in uploads directory first
         uploads_dir = app.config['UPLOAD_FOLDER']
-        zip_path = os.path.join(uploads_dir, filename)
+        # send_file resolves relative paths against the app root, not the working directory
+        zip_path = os.path.abspath(os.path.join(uploads_dir, filename))
         
         if os.path.exists(zip_path):
-            return send_file(zip_path, as_attachment=True, download_name=filename)
+            mark_used(zip_path)
+            if archive_format not in (None, 'zip') and filename.endswith('.zip'):
+                return converted_download(zip_path, filename, archive_format)
+            # Deterministic archives give identical content the same ETag; If-None-Match gets a 304
+            return send_file(zip_path, as_attachment=True, download_name=filename,
+                             etag=content_etag(zip_path), conditional=True)
         
         # If not found in uploads, check temp directories
         temp_dirs = [tempfile.gettempdir()]
@@ -120,13 +594,26 @@ def download_zip(filename):
         for temp_dir in temp_dirs:
             zip_path = os.path.join(temp_dir, filename)
             if os.path.exists(zip_path):
-                return send_file(zip_path, as_attachment=True, download_name=filename)
+                return send_file(zip_path, as_attachment=True, download_name=filename,
+                                 etag=content_etag(zip_path), conditional=True)
         
         return jsonify({'error': 'File not found'}), 404
         
     except Exception as e:
         return jsonify({'error': f'Download error: {str(e)}'}), 500
 
+def not_a_zip(path, action):
+    """Return a 400 response when an artifact is not a ZIP (e.g. a tar.gz build), else None
+
+    Previews, runs and regeneration read ZIP members and the blob store only records ZIPs.
+    """
+    if zipfile.is_zipfile(path):
+        return None
+    archive_format = next((name for name, spec in ARCHIVE_FORMATS.items() if path.endswith(spec['extension'])), None)
+    kind = f"a {archive_format} archive" if archive_format else 'not a ZIP archive'
+    return jsonify({'error': f"{action} works on ZIP artifacts only and {os.path.basename(path)} is {kind}; "
+                             f"generate the project as a ZIP (format=zip) to {action.lower()} it"}), 400
+
 def get_file_tree(directory, base_path=""):
     """Recursively get file tree structure"""
     tree = []
@@ -145,6 +632,36 @@ def get_file_tree(directory, base_path=""):
         pass
     return tree
 
+def manifest_file_tree(manifest):
+    """File tree entries, as get_file_tree returns them, for the files listed in a manifest"""
+    tree = []
+    directories = set()
+    for entry in sorted(manifest['files'], key=lambda entry: entry['path']):
+        parts = entry['path'].split('/')
+        for depth in range(1, len(parts)):
+            directory = '/'.join(parts[:depth])
+            if directory not in directories:
+                directories.add(directory)
+                tree.append((directory, 'directory', None))
+        tree.append((entry['path'], 'file', None))
+    return tree
+
+def read_manifest_file(zip_path, entry):
+    """Read one file listed in an artifact's manifest, from the blob store when it holds it"""
+    blob_path = blob_store.object_path(entry['hash'])
+    if os.path.exists(blob_path):
+        with open(blob_path, 'rb') as f:
+            return f.read()
+    with zipfile.ZipFile(zip_path) as archive:
+        return archive.read(entry['path'])
+
+def artifact_key(zip_path):
+    """Blob store key of an artifact; a current manifest saves re-hashing and re-reading the ZIP"""
+    manifest = read_artifact_manifest(zip_path)
+    if manifest is not None and os.path.exists(blob_store.manifest_path(manifest['archive']['sha256'])):
+        return manifest['archive']['sha256']
+    return blob_store.add_archive(zip_path)
+
 @app.route('/api/preview/<filename>')
 def preview_application(filename):
     try:
@@ -154,49 +671,51 @@ def preview_application(filename):
         
         if not os.path.exists(zip_path):
             return jsonify({'error': 'File not found'}), 404
+        rejected = not_a_zip(zip_path, 'Preview')
+        if rejected:
+            return rejected
         
-        # Extract ZIP to a temporary directory for preview
+        mark_used(zip_path)
         project_name = os.path.splitext(filename)[0]
-        preview_dir = os.path.join(UPLOAD_FOLDER, 'previews', project_name)
-        
-        # Clean up old preview if it exists
-        if os.path.exists(preview_dir):
-            import shutil
-            try:
-                shutil.rmtree(preview_dir)
-            except:
-                pass
-        
-        # Create preview directory
-        os.makedirs(preview_dir, exist_ok=True)
-        
-        # Extract ZIP file
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(preview_dir)
-        
-        # Get the extracted project directory
-        # List what was extracted to determine the structure
-        extracted_contents = os.listdir(preview_dir)
-        
-        # Check if the ZIP created a nested directory structure
-        extracted_dir = preview_dir
-        if len(extracted_contents) == 1 and os.path.isdir(os.path.join(preview_dir, extracted_contents[0])):
-            # ZIP contains a single top-level directory with project name
-            extracted_dir = os.path.join(preview_dir, extracted_contents[0])
-        
-        # Verify the directory exists
-        if not os.path.exists(extracted_dir):
-            raise Exception(f"Extracted directory does not exist: {extracted_dir}")
-        
-        # Get file tree from the root of extracted files
-        file_tree = get_file_tree(extracted_dir)
-        
-        # Look for README.md
-        readme_path = os.path.join(extracted_dir, 'README.md')
-        readme_content = ""
-        if os.path.exists(readme_path):
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                readme_content = f.read()
+        manifest = read_artifact_manifest(zip_path)
+        if manifest is not None:
+            # The manifest sidecar lists every file, so nothing is extracted or walked
+            file_tree = manifest_file_tree(manifest)
+            readme_content = ""
+            readme = next((entry for entry in manifest['files'] if entry['path'] == manifest['readme']), None)
+            if readme is not None:
+                readme_content = read_manifest_file(zip_path, readme).decode('utf-8')
+        else:
+            # Older artifacts have no manifest: materialise and walk them
+            # Each ZIP version gets its own preview directory, linked from the blob store; it is
+            # never deleted under a concurrent request and repeat previews reuse it
+            preview_dir = blob_store.checkout(blob_store.add_archive(zip_path),
+                                              os.path.join(UPLOAD_FOLDER, 'previews', project_name))
+            mark_used(preview_dir)
+            
+            # Get the extracted project directory
+            # List what was extracted to determine the structure
+            extracted_contents = os.listdir(preview_dir)
+            
+            # Check if the ZIP created a nested directory structure
+            extracted_dir = preview_dir
+            if len(extracted_contents) == 1 and os.path.isdir(os.path.join(preview_dir, extracted_contents[0])):
+                # ZIP contains a single top-level directory with project name
+                extracted_dir = os.path.join(preview_dir, extracted_contents[0])
+            
+            # Verify the directory exists
+            if not os.path.exists(extracted_dir):
+                raise Exception(f"Extracted directory does not exist: {extracted_dir}")
+            
+            # Get file tree from the root of extracted files
+            file_tree = get_file_tree(extracted_dir)
+            
+            # Look for README.md
+            readme_path = os.path.join(extracted_dir, 'README.md')
+            readme_content = ""
+            if os.path.exists(readme_path):
+                with open(readme_path, 'r', encoding='utf-8') as f:
+                    readme_content = f.read()
         
         # Generate HTML preview
         file_list_html = ""
@@ -378,9 +897,6 @@ def preview_application(filename):
         </html>
         """, 500
 
-# Store running applications
-running_apps = {}
-
 @app.route('/api/run/<filename>')
 def run_application(filename):
     """Extract and run the application"""
@@ -405,6 +921,9 @@ def run_application(filename):
                 'available_files': similar_files,
                 'searched_path': zip_path
             }), 404
+        rejected = not_a_zip(zip_path, 'Run')
+        if rejected:
+            return rejected
         
         project_name = os.path.splitext(filename)[0]
         
@@ -417,13 +936,10 @@ def run_application(filename):
             })
         
         # Extract application
-        extract_dir = os.path.join(UPLOAD_FOLDER, 'extracted', project_name)
-        if os.path.exists(extract_dir):
-            shutil.rmtree(extract_dir)
-        os.makedirs(extract_dir, exist_ok=True)
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
+        mark_used(zip_path)
+        extract_dir = blob_store.checkout(artifact_key(zip_path),
+                                          os.path.join(UPLOAD_FOLDER, 'extracted', project_name))
+        mark_used(extract_dir)
         
         # Get extracted directory
         extracted_contents = os.listdir(extract_dir)
@@ -439,7 +955,8 @@ def run_application(filename):
             'frontend_port': 3000,
             'backend_process': None,
             'frontend_process': None,
-            'extract_dir': extract_dir
+            'extract_dir': extract_dir,
+            'zip_path': zip_path
         }
         
         # Install and start backend
@@ -523,7 +1040,7 @@ def run_application(filename):
             thread.start()
             time.sleep(1)  # Give the thread a moment to start
         
-        running_apps[project_name] = running_info
+        record_running_app(project_name, running_info)
         
         # Wait a bit for servers to start
         time.sleep(3)
@@ -541,17 +1058,8 @@ def run_application(filename):
 
 @app.route('/api/technologies', methods=['GET'])
 def get_technologies():
-    technologies = [
-        {'id': 'MERN Stack', 'name': 'MERN Stack', 'description': 'MongoDB, Express.js, React.js, Node.js'},
-        {'id': 'MEAN Stack', 'name': 'MEAN Stack', 'description': 'MongoDB, Express.js, Angular, Node.js'},
-        {'id': 'LAMP Stack', 'name': 'LAMP Stack', 'description': 'Linux, Apache, MySQL, PHP'},
-        {'id': 'Django Stack', 'name': 'Django Stack', 'description': 'Python, Django, PostgreSQL, React'},
-        {'id': 'Spring Boot Stack', 'name': 'Spring Boot Stack', 'description': 'Java, Spring Boot, MySQL, React'},
-        {'id': 'Laravel Stack', 'name': 'Laravel Stack', 'description': 'PHP, Laravel, MySQL, Vue.js'},
-        {'id': 'Flask Stack', 'name': 'Flask Stack', 'description': 'Python, Flask, SQLite, React'},
-        {'id': 'Ruby on Rails Stack', 'name': 'Ruby on Rails Stack', 'description': 'Ruby, Rails, PostgreSQL, React'}
-    ]
-    return jsonify(technologies)
+    return jsonify(stacks.available_stacks())
 
 if __name__ == '__main__':
+    start_collector()
     app.run(debug=True, host='0.0.0.0', port=8080)
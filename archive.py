@@ -0,0 +1,436 @@
+import io
+import os
+import calendar
+import gzip
+import time
+import zlib
+import struct
+import tarfile
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:  # tar.zst is offered only when zstandard is installed
+    zstandard = None
+
+# ZIP record layouts (APPNOTE.TXT 4.3.7, 4.3.12, 4.3.16)
+LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+END_RECORD = struct.Struct('<4s4H2LH')
+DATA_DESCRIPTOR = struct.Struct('<4s3L')
+LOCAL_SIGNATURE = b'PK\x03\x04'
+CENTRAL_SIGNATURE = b'PK\x01\x02'
+END_SIGNATURE = b'PK\x05\x06'
+DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+DESCRIPTOR_FLAG = 0x08
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Every member gets the same timestamp so identical content always zips to identical bytes.
+# SOURCE_DATE_EPOCH follows the reproducible-builds convention; the default is the ZIP epoch.
+FIXED_DATE_TIME = max(time.gmtime(int(os.environ.get('SOURCE_DATE_EPOCH', 0)))[:6], (1980, 1, 1, 0, 0, 0))
+
+STORED = zipfile.ZIP_STORED
+DEFLATED = zipfile.ZIP_DEFLATED
+ZIP32_LIMIT = 0xFFFFFFFF
+
+
+# Formats that are already compressed; deflating them again only burns CPU
+COMPRESSED_EXTENSIONS = frozenset((
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.woff', '.woff2', '.pdf',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.jar', '.mp3', '.mp4',
+))
+
+
+class CompressionPolicy:
+    """Chooses the deflate level of each member from its file type and size (0 stores it)
+
+    Tiny files and already-compressed formats are stored. `levels` maps extensions to a
+    level, and text larger than `large_size` uses `large_level`.
+    """
+
+    def __init__(self, level=6, min_size=64, levels=None, large_size=1024 * 1024, large_level=None,
+                 stored_extensions=COMPRESSED_EXTENSIONS, parallel_size=32 * 1024):
+        self.level = level
+        self.min_size = min_size
+        self.levels = dict(levels or {})
+        self.large_size = large_size
+        self.large_level = level if large_level is None else large_level
+        self.stored_extensions = frozenset(stored_extensions)
+        # Smaller members compress faster than a pool hand-off costs. Generated stacks never reach
+        # it (their largest member is about 5 KB and a whole MERN project, 25 KB, zips in about
+        # 1 ms; see `benchmark.py compression`), so the pool only serves projects with large files
+        self.parallel_size = parallel_size
+
+    def level_for(self, name, size):
+        extension = os.path.splitext(name)[1].lower()
+        if size < self.min_size or extension in self.stored_extensions:
+            return 0
+        if size >= self.large_size:
+            return self.large_level
+        return self.levels.get(extension, self.level)
+
+
+DEFAULT_POLICY = CompressionPolicy(
+    level=int(os.environ.get('ZIP_COMPRESSION_LEVEL', 6)),
+    large_level=int(os.environ.get('ZIP_LARGE_FILE_LEVEL', 6)),
+)
+
+COMPRESSION_WORKERS = int(os.environ.get('ZIP_WORKERS', 0)) or min(4, os.cpu_count() or 1)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def compression_pool():
+    """Shared thread pool for deflating large members; zlib releases the GIL while it works"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=COMPRESSION_WORKERS, thread_name_prefix='deflate')
+    return _pool
+
+
+class ZipMember:
+    """A compressed member ready to be written: name, method, CRC32, sizes and raw bytes"""
+
+    __slots__ = ('name', 'method', 'crc', 'compress_size', 'file_size', 'raw')
+
+    def __init__(self, name, method, crc, compress_size, file_size, raw):
+        self.name = name
+        self.method = method
+        self.crc = crc
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.raw = raw
+
+
+def compress_member(name, data, level=6):
+    """Deflate data into a ZipMember, storing it instead when deflate would not shrink it"""
+    crc = zlib.crc32(data)
+    if level:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        raw = compressor.compress(data) + compressor.flush()
+        if len(raw) < len(data):
+            return ZipMember(name, DEFLATED, crc, len(raw), len(data), raw)
+    return ZipMember(name, STORED, crc, len(data), len(data), data)
+
+
+class PrecompressedBytes(bytes):
+    """File content that carries its own compressed member, so archives copy it instead of deflating again
+
+    Used for template output that is identical for every request; it behaves as plain bytes
+    everywhere else.
+    """
+
+    def __new__(cls, data, level=6):
+        self = super().__new__(cls, data)
+        self.level = level
+        self.member = compress_member('', data, level)
+        return self
+
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time[:6]
+    return (((year - 1980) << 9) | (month << 5) | day), ((hour << 11) | (minute << 5) | (second // 2))
+
+
+class ZipWriter:
+    """Minimal ZIP writer that can copy already-compressed members into the archive
+
+    It only ever appends to `fileobj` and tracks offsets itself, so the output may be a
+    plain file, a BytesIO or a non-seekable stream. With `data_descriptors`, members that
+    need compressing are deflated piece by piece as they are written and their CRC and sizes
+    follow the data, so nothing has to be compressed ahead of its header.
+    """
+
+    def __init__(self, fileobj, date_time=None, comment=b'', data_descriptors=False):
+        self.fileobj = fileobj
+        self.comment = comment
+        self.data_descriptors = data_descriptors
+        self._date, self._time = _dos_date_time(date_time or FIXED_DATE_TIME)
+        self._central = []
+        self._names = set()
+        self._offset = 0
+
+    def _write(self, data):
+        self.fileobj.write(data)
+        self._offset += len(data)
+
+    def add(self, name, data, level=6):
+        """Compress and write a member, reusing the deflate stream of PrecompressedBytes"""
+        if isinstance(data, PrecompressedBytes) and data.level == level:
+            member = data.member
+            return self.add_member(ZipMember(name, member.method, member.crc,
+                                             member.compress_size, member.file_size, member.raw))
+        if self.data_descriptors and level:
+            return self._add_streamed(name, data, level)
+        return self.add_member(compress_member(name, data, level))
+
+    def _check_member(self, name, size):
+        if name in self._names:
+            raise ValueError(f"Duplicate archive member: {name}")
+        if max(size, self._offset) >= ZIP32_LIMIT:
+            raise ValueError("Archive too large for ZIP32")
+
+    def _add_streamed(self, name, data, level):
+        """Write a deflated member with a data descriptor instead of sizes in its local header"""
+        self._check_member(name, len(data))
+        encoded_name = name.encode('utf-8')
+        flags = DESCRIPTOR_FLAG | (0x800 if not name.isascii() else 0)
+        header_offset = self._offset
+        self._write(LOCAL_HEADER.pack(
+            LOCAL_SIGNATURE, 20, flags, DEFLATED, self._time, self._date, 0, 0, 0, len(encoded_name), 0))
+        self._write(encoded_name)
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        crc = 0
+        compress_size = 0
+        view = memoryview(data)
+        for start in range(0, len(data), STREAM_CHUNK_SIZE):
+            chunk = view[start:start + STREAM_CHUNK_SIZE]
+            crc = zlib.crc32(chunk, crc)
+            raw = compressor.compress(chunk)
+            compress_size += len(raw)
+            self._write(raw)
+        raw = compressor.flush()
+        compress_size += len(raw)
+        self._write(raw)
+        self._write(DATA_DESCRIPTOR.pack(DESCRIPTOR_SIGNATURE, crc, compress_size, len(data)))
+        member = ZipMember(name, DEFLATED, crc, compress_size, len(data), None)
+        self._names.add(name)
+        self._central.append((encoded_name, flags, member, header_offset))
+        return member
+
+    def add_member(self, member):
+        """Write a member whose data is already compressed"""
+        self._check_member(member.name, max(member.compress_size, member.file_size))
+        encoded_name = member.name.encode('utf-8')
+        # Bit 11 marks the name as UTF-8
+        flags = 0x800 if not member.name.isascii() else 0
+        header_offset = self._offset
+        self._write(LOCAL_HEADER.pack(
+            LOCAL_SIGNATURE, 20, flags, member.method, self._time, self._date,
+            member.crc, member.compress_size, member.file_size, len(encoded_name), 0))
+        self._write(encoded_name)
+        self._write(member.raw)
+        self._names.add(member.name)
+        self._central.append((encoded_name, flags, member, header_offset))
+        return member
+
+    def close(self):
+        """Write the central directory and end record"""
+        central_offset = self._offset
+        for encoded_name, flags, member, header_offset in self._central:
+            self._write(CENTRAL_HEADER.pack(
+                CENTRAL_SIGNATURE, (3 << 8) | 20, 20, flags, member.method, self._time, self._date,
+                member.crc, member.compress_size, member.file_size, len(encoded_name), 0, 0, 0, 0,
+                0o100644 << 16, header_offset))
+            self._write(encoded_name)
+        central_size = self._offset - central_offset
+        self._write(END_RECORD.pack(
+            END_SIGNATURE, 0, 0, len(self._central), len(self._central),
+            central_size, central_offset, len(self.comment)))
+        self._write(self.comment)
+
+
+def read_raw_member(fileobj, info):
+    """Return the ZipMember for `info` from an open archive file, without decompressing it"""
+    fileobj.seek(info.header_offset)
+    header = LOCAL_HEADER.unpack(fileobj.read(LOCAL_HEADER.size))
+    if header[0] != LOCAL_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    fileobj.seek(header[9] + header[10], 1)
+    raw = fileobj.read(info.compress_size)
+    return ZipMember(info.filename, info.compress_type, info.CRC, info.compress_size, info.file_size, raw)
+
+
+class ZipArchiveSink:
+    """Writes (path, bytes) members straight into a ZIP archive without staging them on disk
+
+    `target` is a file path or any writable binary file object (e.g. io.BytesIO). Members are
+    compressed according to `policy`; with `parallel`, large members are deflated on the
+    shared compression pool and still written in the order they arrive.
+    """
+
+    def __init__(self, target, comment=b'', policy=None, parallel=True):
+        self._owns_file = isinstance(target, str)
+        self._file = open(target, 'wb') if self._owns_file else target
+        self._writer = ZipWriter(self._file, comment=comment)
+        self.policy = policy or DEFAULT_POLICY
+        self.parallel = parallel
+        self.names = []
+        self.total_bytes = 0
+
+    def write(self, path, data):
+        self._writer.add(path, data, self.policy.level_for(path, len(data)))
+        self.names.append(path)
+        self.total_bytes += len(data)
+
+    def write_member(self, member):
+        """Copy a member that is already compressed, e.g. from an older archive"""
+        self._writer.add_member(member)
+        self.names.append(member.name)
+        self.total_bytes += member.file_size
+
+    def write_all(self, files):
+        """Consume an iterable of (path, bytes) pairs"""
+        # With a single core the pool would only add hand-off overhead
+        if not self.parallel or COMPRESSION_WORKERS < 2:
+            for path, data in files:
+                self.write(path, data)
+            return self
+        
+        # A bounded window of in-flight members keeps memory flat for long streams
+        pool = compression_pool()
+        window = COMPRESSION_WORKERS * 2
+        pending = deque()
+        for path, data in files:
+            level = self.policy.level_for(path, len(data))
+            reusable = isinstance(data, PrecompressedBytes) and data.level == level
+            if level and not reusable and len(data) >= self.policy.parallel_size:
+                pending.append((path, data, pool.submit(compress_member, path, data, level)))
+            else:
+                pending.append((path, data, None))
+            while len(pending) > window:
+                self._write_pending(pending.popleft())
+        while pending:
+            self._write_pending(pending.popleft())
+        return self
+
+    def _write_pending(self, item):
+        path, data, future = item
+        if future is None:
+            self.write(path, data)
+        else:
+            self._writer.add_member(future.result())
+            self.names.append(path)
+            self.total_bytes += len(data)
+
+    def set_comment(self, comment):
+        self._writer.comment = comment
+
+    def close(self):
+        try:
+            self._writer.close()
+        finally:
+            if self._owns_file:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _ChunkBuffer:
+    """Write-only file object whose contents are drained by a generator"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(files, comment=b'', policy=None):
+    """Yield a ZIP archive as byte chunks while consuming (path, bytes) pairs
+
+    Each member's bytes are yielded as soon as it is written, so only one member is ever
+    buffered and the first chunk is available before later files are generated. `comment`
+    may be a callable, called once every member has been written.
+    """
+    policy = policy or DEFAULT_POLICY
+    buffer = _ChunkBuffer()
+    writer = ZipWriter(buffer, data_descriptors=True)
+    for path, data in files:
+        writer.add(path, data, policy.level_for(path, len(data)))
+        yield buffer.drain()
+    writer.comment = comment() if callable(comment) else comment
+    writer.close()
+    yield buffer.drain()
+
+
+def write_zip(target, files, comment=b'', policy=None, parallel=True):
+    """Stream (path, bytes) pairs into a ZIP at target and return the member names"""
+    with ZipArchiveSink(target, comment, policy, parallel) as sink:
+        sink.write_all(files)
+    return sink.names
+
+
+# Artifact formats: file extension and media type. Tarballs are compressed as one solid
+# stream, which suits projects made of many small, similar text files.
+ARCHIVE_FORMATS = {
+    'zip': {'extension': '.zip', 'mimetype': 'application/zip'},
+    'tar.gz': {'extension': '.tar.gz', 'mimetype': 'application/gzip'},
+    'tar.zst': {'extension': '.tar.zst', 'mimetype': 'application/zstd'},
+}
+TAR_GZIP_LEVEL = int(os.environ.get('TAR_GZIP_LEVEL', 6))
+TAR_ZSTD_LEVEL = int(os.environ.get('TAR_ZSTD_LEVEL', 10))
+
+
+def available_formats():
+    """List the archive formats this installation can produce"""
+    return [name for name in ARCHIVE_FORMATS if name != 'tar.zst' or zstandard is not None]
+
+
+def _tar_compressor(buffer, archive_format, level=None):
+    if archive_format == 'tar.gz':
+        # mtime=0 keeps the gzip header reproducible
+        return gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=level or TAR_GZIP_LEVEL, mtime=0)
+    if archive_format == 'tar.zst' and zstandard is not None:
+        return zstandard.ZstdCompressor(level=level or TAR_ZSTD_LEVEL).stream_writer(buffer, closefd=False)
+    raise ValueError(f"Unsupported archive format: {archive_format}")
+
+
+def stream_tar(files, archive_format='tar.gz', level=None):
+    """Yield a compressed tarball as byte chunks while consuming (path, bytes) pairs
+
+    Like stream_zip, members are compressed as they arrive and whatever the compressor has
+    flushed so far is yielded after each one. Entries carry fixed owners, modes and
+    timestamps so the output is reproducible.
+    """
+    buffer = _ChunkBuffer()
+    compressor = _tar_compressor(buffer, archive_format, level)
+    with tarfile.open(fileobj=compressor, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+        mtime = calendar.timegm(FIXED_DATE_TIME)
+        for path, data in files:
+            info = tarfile.TarInfo(path)
+            info.size = len(data)
+            info.mtime = mtime
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    compressor.close()
+    yield buffer.drain()
+
+
+def write_archive(target, files, archive_format='zip', comment=b''):
+    """Write (path, bytes) pairs to a path in any ARCHIVE_FORMATS format and return the member names
+
+    ZIPs go through ZipArchiveSink; the comment only applies to them.
+    """
+    if archive_format == 'zip':
+        return write_zip(target, files, comment)
+    names = []
+    
+    def recorded():
+        for path, data in files:
+            names.append(path)
+            yield path, data
+    
+    with open(target, 'wb') as f:
+        for chunk in stream_tar(recorded(), archive_format):
+            f.write(chunk)
+    return names
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Research Paper Agent generation pipeline
+Run `python benchmark.py <name>` to run a single benchmark, or no arguments to run all of them
+"""
+
+import argparse
+import time
+
+SAMPLE_CONCEPTS = {
+    'keywords': ['Faculty', 'Evaluation', 'Research', 'System', 'Performance',
+                 'Appraisal', 'Institution', 'Academic', 'Web', 'Student', 'Analysis'],
+    'technical_terms': ['user', 'database', 'dashboard', 'authentication'],
+    'features': ['User Management', 'Authentication System', 'Dashboard', 'Analytics & Reporting'],
+    'content_length': 42000
+}
+
+
+def _time_per_call(func, iterations):
+    """Return the average wall time of func() in microseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_generation(iterations=2000):
+    """Per-request generation cost for each technology stack"""
+    from paper_agent import research_agent
+    import stacks
+
+    print(f"{'Technology':<22}{'files':>6}{'first call (us)':>18}{'render (us)':>14}{'cached (us)':>14}")
+    for technology in [stack['id'] for stack in stacks.available_stacks()]:
+        start = time.perf_counter()
+        files = research_agent.generate_code_for_technology(SAMPLE_CONCEPTS, 'research-app', technology)
+        first_call = (time.perf_counter() - start) * 1e6
+        plugin = stacks.load_plugin(technology)
+        render = _time_per_call(lambda: plugin.generate(SAMPLE_CONCEPTS, 'research-app'), iterations)
+        cached = _time_per_call(
+            lambda: research_agent.generate_code_for_technology(SAMPLE_CONCEPTS, 'research-app', technology),
+            iterations
+        )
+        print(f"{technology:<22}{len(files):>6}{first_call:>18.1f}{render:>14.1f}{cached:>14.1f}")
+
+
+_IMPORT_PROBE = """
+import sys, time, resource, importlib, pkgutil
+start = time.perf_counter()
+if sys.argv[2] == 'eager':
+    # Baseline: what importing everything up front costs, as before plugins and deferred imports
+    import stacks as registry
+    for info in pkgutil.iter_modules(registry.__path__):
+        importlib.import_module(f"stacks.{info.name}")
+    for name in ('pdfplumber', 'agent'):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+# ru_maxrss is KiB on Linux, bytes on macOS
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+stacks = sys.modules.get('stacks')
+if stacks is not None:
+    stacks.load_plugin('MERN Stack').generate({}, 'research-app')
+    stacks.load_plugin('Flask Stack').generate({}, 'research-app')
+plugins = sorted(name[len('stacks.'):] for name in sys.modules if name.startswith('stacks.'))
+print(f"{elapsed * 1000:.0f} {rss:.1f} {len(sys.modules)} {','.join(plugins)}")
+"""
+
+
+def bench_imports():
+    """Import time, peak RSS and loaded stack plugins per entry module, lazy vs importing everything first"""
+    import os
+    import subprocess
+    import sys
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    print(f"{'module':<14}{'imports':<8}{'import (ms)':>12}{'RSS (MB)':>10}{'modules':>9}  stack modules imported after MERN+Flask requests")
+    for module in ['paper_agent', 'app', 'agent']:
+        # Each in a fresh interpreter, so neither measurement warms the other
+        for mode in ('eager', 'lazy'):
+            result = subprocess.run([sys.executable, '-c', _IMPORT_PROBE, module, mode],
+                                    cwd=here, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{module:<14}{mode:<8}failed: {result.stderr.strip().splitlines()[-1]}")
+                continue
+            elapsed, rss, modules, plugins = (result.stdout.split() + [''])[:4]
+            print(f"{module:<14}{mode:<8}{elapsed:>12}{rss:>10}{modules:>9}  {plugins}")
+
+
+def bench_fanout(rounds=5):
+    """All-stacks generation: separate builds vs one fan-out, in the calling thread and on a thread pool"""
+    import shutil
+    import tempfile
+    from paper_agent import research_agent
+    from generation_cache import generation_cache
+    import stacks
+
+    technologies = [stack['id'] for stack in stacks.available_stacks()]
+    output_dir = tempfile.mkdtemp()
+    try:
+        def sequential():
+            generation_cache.clear()
+            for technology in technologies:
+                research_agent.build_artifact(SAMPLE_CONCEPTS, 'research-app', technology, output_dir)
+
+        def fanout(workers):
+            generation_cache.clear()
+            research_agent.build_artifacts(SAMPLE_CONCEPTS, 'research-app', technologies, output_dir,
+                                           max_workers=workers)
+
+        sequential()
+        print(f"{len(technologies)} stacks, excluding PDF extraction (which fan-out runs once instead of per stack)")
+        print(f"separate builds:            {_time_per_call(sequential, rounds) / 1000:.1f} ms")
+        print(f"fan-out, calling thread:    {_time_per_call(lambda: fanout(1), rounds) / 1000:.1f} ms")
+        print(f"fan-out, 4 pooled threads:  {_time_per_call(lambda: fanout(4), rounds) / 1000:.1f} ms")
+    finally:
+        generation_cache.clear()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def bench_features():
+    """Artifact size, file and dependency counts as detected features switch modules on"""
+    import shutil
+    import tempfile
+    from paper_agent import research_agent
+    from generation_cache import generation_cache
+
+    feature_sets = {
+        'none': [],
+        'auth': ['Authentication System'],
+        'dashboard': ['Dashboard'],
+        'all': SAMPLE_CONCEPTS['features'],
+    }
+    output_dir = tempfile.mkdtemp()
+    try:
+        print(f"{'features':<12}{'modules':<18}{'files':>6}{'deps':>6}{'bytes':>8}{'ZIP bytes':>11}")
+        for label, features in feature_sets.items():
+            concepts = dict(SAMPLE_CONCEPTS, features=features)
+            stats = research_agent.build_artifact(concepts, 'research-app', 'MERN Stack', output_dir, label)['stats']
+            modules = ','.join(stats['modules']) or '-'
+            print(f"{label:<12}{modules:<18}{stats['files']:>6}{stats['dependencies']:>6}"
+                  f"{stats['bytes']:>8}{stats['archive_bytes']:>11}")
+    finally:
+        generation_cache.clear()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def bench_archive(iterations=300):
+    """ZIP writing cost with static members copied pre-compressed vs deflated on every request"""
+    import io
+    from paper_agent import research_agent
+    from archive import PrecompressedBytes, write_zip
+    import stacks
+
+    print(f"{'Technology':<22}{'files':>6}{'static':>8}{'deflate all (us)':>18}{'precompressed (us)':>20}")
+    for technology in [stack['id'] for stack in stacks.available_stacks()]:
+        files = list(research_agent.iter_project_files(SAMPLE_CONCEPTS, 'research-app', technology))
+        plain = [(path, bytes(data)) for path, data in files]
+        static = sum(1 for _, data in files if isinstance(data, PrecompressedBytes))
+        deflate_all = _time_per_call(lambda: write_zip(io.BytesIO(), plain), iterations)
+        precompressed = _time_per_call(lambda: write_zip(io.BytesIO(), files), iterations)
+        print(f"{technology:<22}{len(files):>6}{static:>8}{deflate_all:>18.1f}{precompressed:>20.1f}")
+
+
+def bench_validation(iterations=200):
+    """Syntax validation per stack: first check of each file vs verdicts cached by content hash"""
+    from paper_agent import research_agent
+    from validation import FileValidator
+    import stacks
+
+    validator = FileValidator()
+    print(f"node available: {validator.node is not None}; TypeScript checker (esbuild/tsc): {validator.typescript is not None}")
+    print(f"{'Technology':<22}{'files':>6}{'invalid':>9}{'first (ms)':>12}{'cached (us)':>13}")
+    for technology in [stack['id'] for stack in stacks.available_stacks()]:
+        files = list(research_agent.iter_project_files(SAMPLE_CONCEPTS, 'research-app', technology))
+        start = time.perf_counter()
+        invalid = validator.validate(files)
+        first = (time.perf_counter() - start) * 1000
+        cached = _time_per_call(lambda: validator.validate(files), iterations)
+        print(f"{technology:<22}{len(files):>6}{len(invalid):>9}{first:>12.1f}{cached:>13.1f}")
+
+
+def bench_leaks(generations=1000):
+    """Temp directories and open files left behind by repeated ZIP generation"""
+    import io
+    import os
+    import shutil
+    import tempfile
+    from paper_agent import PipelineContext, research_agent
+
+    temp_root = tempfile.gettempdir()
+    output_dir = tempfile.mkdtemp()
+    fd_dir = '/proc/self/fd'
+    try:
+        before = set(os.listdir(temp_root))
+        fds_before = len(os.listdir(fd_dir)) if os.path.isdir(fd_dir) else None
+        start = time.perf_counter()
+        for index in range(generations):
+            concepts = dict(SAMPLE_CONCEPTS, keywords=SAMPLE_CONCEPTS['keywords'] + [f"k{index}"])
+            context = PipelineContext('leak-check', generated_code=research_agent.generate_mern_code(concepts, f"leak-{index}"))
+            zip_path = research_agent.create_zip_file(context, output_dir)
+            if zip_path.startswith('Error'):
+                raise RuntimeError(zip_path)
+            research_agent.write_project_zip(io.BytesIO(), context.generated_code)
+        elapsed = time.perf_counter() - start
+        leaked = sorted(set(os.listdir(temp_root)) - before)
+        print(f"{generations} generations ({elapsed / generations * 1e6:.0f} us each, file + BytesIO)")
+        print(f"new entries in {temp_root}: {len(leaked)}{' ' + ', '.join(leaked[:5]) if leaked else ''}")
+        if fds_before is not None:
+            print(f"open file descriptors: {fds_before} -> {len(os.listdir(fd_dir))}")
+        if leaked:
+            raise SystemExit("temporary files leaked")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def bench_stream():
+    """Streamed ZIP delivery: time to first byte, total time and largest buffered chunk"""
+    from paper_agent import research_agent
+    from generation_cache import generation_cache
+    from validation import file_validator
+    import stacks
+
+    # Validation verdicts and compiled templates are warm in a running server
+    for technology in [stack['id'] for stack in stacks.available_stacks()]:
+        file_validator.validate(research_agent.iter_project_files(SAMPLE_CONCEPTS, 'warm-up', technology))
+    generation_cache.clear()
+    print(f"{'Technology':<22}{'first byte (us)':>16}{'total (us)':>12}{'chunks':>8}{'max chunk':>11}{'ZIP bytes':>11}")
+    for technology in [stack['id'] for stack in stacks.available_stacks()]:
+        start = time.perf_counter()
+        chunks = research_agent.stream_artifact(SAMPLE_CONCEPTS, 'research-app', technology)
+        sizes = [len(next(chunks))]
+        first_byte = (time.perf_counter() - start) * 1e6
+        sizes.extend(len(chunk) for chunk in chunks)
+        total = (time.perf_counter() - start) * 1e6
+        print(f"{technology:<22}{first_byte:>16.0f}{total:>12.0f}{len(sizes):>8}{max(sizes):>11}{sum(sizes):>11}")
+
+
+def _large_project(copies=40):
+    """A large generated project: many copies of the MERN files plus a few multi-megabyte text files"""
+    import json
+    from paper_agent import research_agent
+
+    base = list(research_agent.iter_project_files(SAMPLE_CONCEPTS, 'research-app', 'MERN Stack'))
+    files = []
+    for copy in range(copies):
+        for path, data in base:
+            files.append((f"module{copy}/{path}", bytes(data) + f"\n// module {copy}\n".encode('utf-8')))
+    sources = b''.join(data for _, data in files if _.endswith('.js'))
+    files.append(('dist/bundle.js', sources))
+    records = [{'id': index, 'title': f"Paper {index}", 'keywords': SAMPLE_CONCEPTS['keywords'][index % 11:]}
+               for index in range(40000)]
+    files.append(('data/seed.json', json.dumps(records, indent=2).encode('utf-8')))
+    return files
+
+
+def bench_compression(rounds=3):
+    """Archive build time vs compression ratio per policy, serial vs parallel, for generated stacks and a large project"""
+    import io
+    from paper_agent import research_agent
+    from archive import COMPRESSION_WORKERS, CompressionPolicy, DEFAULT_POLICY, write_zip
+    import stacks
+
+    # Every member of a generated stack sent to the deflate pool, whatever its size: shows whether
+    # lowering the parallel_size threshold would ever pay off for real projects
+    print(f"Generated stacks (pool threshold {DEFAULT_POLICY.parallel_size // 1024} KB)")
+    print(f"{'Technology':<22}{'total (KB)':>11}{'largest (KB)':>13}{'serial (us)':>12}{'all pooled (us)':>16}")
+    everything_pooled = CompressionPolicy(parallel_size=0)
+    for technology in [stack['id'] for stack in stacks.available_stacks()]:
+        project = [(path, bytes(data)) for path, data in
+                   research_agent.iter_project_files(SAMPLE_CONCEPTS, 'research-app', technology)]
+        serial = _time_per_call(lambda: write_zip(io.BytesIO(), project, parallel=False), rounds * 100)
+        pooled = _time_per_call(lambda: write_zip(io.BytesIO(), project, policy=everything_pooled), rounds * 100)
+        print(f"{technology:<22}{sum(len(data) for _, data in project) / 1024:>11.1f}"
+              f"{max(len(data) for _, data in project) / 1024:>13.1f}{serial:>12.0f}{pooled:>16.0f}")
+    print()
+
+    files = _large_project()
+    total = sum(len(data) for _, data in files)
+    print(f"{len(files)} files, {total / 1e6:.1f} MB uncompressed, {COMPRESSION_WORKERS} deflate workers (set ZIP_WORKERS)")
+    print(f"{'policy':<26}{'ratio':>7}{'serial (ms)':>13}{'parallel (ms)':>15}")
+    policies = {
+        'store everything': CompressionPolicy(level=0, large_level=0),
+        'level 1': CompressionPolicy(level=1),
+        'level 6 (default)': CompressionPolicy(level=6),
+        'level 9': CompressionPolicy(level=9),
+        'level 6, large files at 1': CompressionPolicy(level=6, large_level=1),
+    }
+    for label, policy in policies.items():
+        output = io.BytesIO()
+        write_zip(output, files, policy=policy)
+        ratio = total / len(output.getvalue())
+        serial = _time_per_call(lambda: write_zip(io.BytesIO(), files, policy=policy, parallel=False), rounds)
+        parallel = _time_per_call(lambda: write_zip(io.BytesIO(), files, policy=policy), rounds)
+        print(f"{label:<26}{ratio:>7.2f}{serial / 1000:>13.1f}{parallel / 1000:>15.1f}")
+
+
+def bench_formats(rounds=3):
+    """Artifact size and build time per archive format, for a typical and a large project"""
+    import io
+    from paper_agent import research_agent
+    from archive import available_formats, stream_tar, write_zip
+
+    def build_zip(files):
+        output = io.BytesIO()
+        write_zip(output, files)
+        return output.getvalue()
+
+    variants = [('zip', build_zip)]
+    for archive_format, levels in (('tar.gz', (6, 9)), ('tar.zst', (3, 10, 19))):
+        if archive_format in available_formats():
+            variants += [(f"{archive_format} -{level}",
+                          lambda files, archive_format=archive_format, level=level:
+                          b''.join(stream_tar(iter(files), archive_format, level)))
+                         for level in levels]
+    if 'tar.zst' not in available_formats():
+        print("zstandard is not installed; tar.zst skipped")
+
+    projects = {
+        'MERN project': list(research_agent.iter_project_files(SAMPLE_CONCEPTS, 'research-app', 'MERN Stack')),
+        'large project': _large_project(),
+    }
+    for label, files in projects.items():
+        total = sum(len(data) for _, data in files)
+        print(f"\n{label}: {len(files)} files, {total} bytes")
+        print(f"{'format':<16}{'bytes':>10}{'ratio':>8}{'build (ms)':>12}")
+        for name, build in variants:
+            size = len(build(files))
+            elapsed = _time_per_call(lambda: build(files), rounds) / 1000
+            print(f"{name:<16}{size:>10}{total / size:>8.2f}{elapsed:>12.2f}")
+
+def bench_publishing(writers=8, rounds=20):
+    """Concurrent builds of one artifact name while readers open it: partial or missing files seen"""
+    import os
+    import shutil
+    import tempfile
+    import threading
+    import zipfile
+    from paper_agent import research_agent
+    from generation_cache import generation_cache
+
+    output_dir = tempfile.mkdtemp()
+    zip_path = os.path.join(output_dir, 'shared.zip')
+    errors = []
+    done = threading.Event()
+
+    def write(worker):
+        for round_number in range(rounds):
+            concepts = dict(SAMPLE_CONCEPTS, keywords=[f"w{worker}r{round_number}"])
+            result = research_agent.build_artifact(concepts, 'research-app', 'MERN Stack', output_dir, 'shared')
+            if 'error' in result:
+                errors.append(result['error'])
+
+    def read():
+        reads = 0
+        while not done.is_set():
+            try:
+                with zipfile.ZipFile(zip_path) as archive:
+                    if archive.testzip() is not None:
+                        errors.append('corrupt member')
+                reads += 1
+            except FileNotFoundError:
+                pass
+            except zipfile.BadZipFile as e:
+                errors.append(f"partial archive: {e}")
+        counts.append(reads)
+
+    counts = []
+    try:
+        generation_cache.clear()
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(writers)]
+        start = time.perf_counter()
+        for thread in readers + threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+        leftovers = [name for name in os.listdir(output_dir) if name not in ('shared.zip', 'shared.zip.manifest.json')]
+        print(f"{writers * rounds} builds by {writers} threads, {sum(counts)} concurrent reads "
+              f"in {time.perf_counter() - start:.2f} s")
+        print(f"errors: {len(errors)}{' ' + errors[0] if errors else ''}; leftover temp files: {len(leftovers)}")
+        if errors or leftovers:
+            raise SystemExit("unsafe publishing")
+    finally:
+        generation_cache.clear()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def bench_preview(rounds=50):
+    """Listing an artifact's files and README: manifest sidecar vs extracting and walking the ZIP"""
+    import os
+    import shutil
+    import tempfile
+    import zipfile
+    from paper_agent import research_agent, read_artifact_manifest
+
+    output_dir = tempfile.mkdtemp()
+    try:
+        result = research_agent.build_artifact(SAMPLE_CONCEPTS, 'research-app', 'MERN Stack', output_dir)
+        zip_path = result['zip_path']
+
+        def from_manifest():
+            manifest = read_artifact_manifest(zip_path)
+            with zipfile.ZipFile(zip_path) as archive:
+                readme = archive.read(manifest['readme'])
+            return sorted(entry['path'] for entry in manifest['files']), readme
+
+        def from_extraction():
+            target = tempfile.mkdtemp(dir=output_dir)
+            with zipfile.ZipFile(zip_path) as archive:
+                archive.extractall(target)
+            paths = sorted(os.path.relpath(os.path.join(directory, name), target).replace(os.sep, '/')
+                           for directory, _, names in os.walk(target) for name in names)
+            with open(os.path.join(target, 'README.md'), 'rb') as f:
+                readme = f.read()
+            shutil.rmtree(target)
+            return paths, readme
+
+        if from_manifest() != from_extraction():
+            raise SystemExit("manifest does not match the archive")
+        for label, func in (('manifest sidecar', from_manifest), ('extract + walk', from_extraction)):
+            print(f"{label:<18}{_time_per_call(func, rounds):>10.0f} us")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def bench_gc(projects=50):
+    """Artifact collector: TTL and quota eviction over many projects, bytes reclaimed and run time"""
+    import os
+    import shutil
+    import tempfile
+    from paper_agent import research_agent
+    from blob_store import BlobStore
+    from garbage_collector import ArtifactCollector
+    from generation_cache import generation_cache
+
+    upload_dir = tempfile.mkdtemp()
+    try:
+        store = BlobStore(os.path.join(upload_dir, 'blobs'))
+        old = time.time() - 30 * 24 * 60 * 60
+        for index in range(projects):
+            concepts = dict(SAMPLE_CONCEPTS, keywords=[f"gc{index}"])
+            result = research_agent.build_artifact(concepts, f"project-{index}", 'MERN Stack', upload_dir, store=store)
+            store.checkout(store.add_archive(result['zip_path']), os.path.join(upload_dir, 'previews', f"project-{index}"))
+        # The older half was last used a month ago; the newest project belongs to a running app
+        aged = {f"project-{index}" for index in range(projects // 2)}
+        for directory, names, files in os.walk(upload_dir):
+            for name in names + files:
+                path = os.path.join(directory, name)
+                parts = os.path.relpath(path, upload_dir).split(os.sep)
+                if parts[0] == 'blobs' or any(part.split('.')[0] in aged for part in parts):
+                    os.utime(path, (old, old))
+        running = os.path.join(upload_dir, f"project-{projects - 1}.zip")
+        collector = ArtifactCollector(upload_dir, store, grace=0, protected=lambda: [running])
+        before = collector.disk_usage()
+        report = collector.collect()
+        print(f"TTL pass: {before} -> {report['usage_bytes']} bytes, reclaimed {report['bytes_reclaimed']} "
+              f"in {report['duration_ms']} ms, removed {report['removed']}")
+        collector.quota_bytes = report['usage_bytes'] // 4
+        report = collector.collect()
+        print(f"quota {collector.quota_bytes}: now {report['usage_bytes']} bytes, reclaimed {report['bytes_reclaimed']} "
+              f"in {report['duration_ms']} ms, removed {report['removed']}")
+        if not os.path.exists(running):
+            raise SystemExit("a protected artifact was evicted")
+    finally:
+        generation_cache.clear()
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+
+def bench_upload(megabytes=64):
+    """Receiving a large multipart upload: buffered save-then-hash vs streamed hashing into the upload store"""
+    import os
+    import shutil
+    import tempfile
+    import tracemalloc
+    from werkzeug.test import EnvironBuilder
+    from werkzeug.wrappers import Request
+    from blob_store import file_digest
+    from upload_store import UploadStore
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        store = UploadStore(os.path.join(work_dir, 'pdfs'), spool_bytes=16 * 1024 * 1024)
+
+        class StreamedRequest(Request):
+            # As app.UploadRequest
+            def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+                return store.spool()
+
+        # The request body is read from disk, as it would be from the socket
+        boundary = 'benchmark-boundary'
+        body_path = os.path.join(work_dir, 'body')
+        with open(body_path, 'wb') as f:
+            f.write(f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="thesis.pdf"\r\n'
+                    f'Content-Type: application/pdf\r\n\r\n'.encode('ascii'))
+            for _ in range(megabytes):
+                f.write(os.urandom(1024 * 1024))
+            f.write(f'\r\n--{boundary}--\r\n'.encode('ascii'))
+
+        def receive(request_class, store_file):
+            with open(body_path, 'rb') as body:
+                environ = EnvironBuilder(method='POST', input_stream=body, content_length=os.path.getsize(body_path),
+                                         content_type=f'multipart/form-data; boundary={boundary}').get_environ()
+                request = request_class(environ)
+                tracemalloc.start()
+                start = time.perf_counter()
+                result = store_file(request.files['file'])
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                request.close()
+            return result, elapsed, peak
+
+        def buffered(file):
+            # The previous upload path: save the parsed file, then hash it in a second pass
+            path = os.path.join(work_dir, 'thesis.pdf')
+            file.save(path)
+            return path, file_digest(path), False
+
+        print(f"{'path':<10}{'MB':>6}{'ms':>10}{'peak MB':>10}  duplicate")
+        for name, request_class, store_file in (
+                ('buffered', Request, buffered),
+                ('streamed', StreamedRequest, lambda file: store.commit(file.stream)),
+                ('repeated', StreamedRequest, lambda file: store.commit(file.stream))):
+            (path, digest, duplicate), elapsed, peak = receive(request_class, store_file)
+            print(f"{name:<10}{megabytes:>6}{elapsed * 1000:>10.1f}{peak / 1024 / 1024:>10.1f}  {duplicate}")
+        leftovers = [name for name in os.listdir(store.root) if not name.endswith('.pdf')]
+        if not duplicate or len(os.listdir(store.root)) != 1 or leftovers:
+            raise SystemExit("identical upload stored twice or temporary files left behind")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+BENCHMARKS = {
+    'generation': bench_generation,
+    'imports': bench_imports,
+    'fanout': bench_fanout,
+    'features': bench_features,
+    'archive': bench_archive,
+    'validation': bench_validation,
+    'leaks': bench_leaks,
+    'stream': bench_stream,
+    'compression': bench_compression,
+    'formats': bench_formats,
+    'publishing': bench_publishing,
+    'preview': bench_preview,
+    'gc': bench_gc,
+    'upload': bench_upload,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run: {', '.join(BENCHMARKS)}")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        print(f"\n== {name}: {BENCHMARKS[name].__doc__} ==")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import os
+import json
+import stat
+import shutil
+import hashlib
+import tempfile
+import zipfile
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, data, mode=None):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def remove_tree(path):
+    """rmtree that also removes read-only files (stored blobs are linked read-only)"""
+    def make_writable(function, failed_path, _):
+        os.chmod(failed_path, stat.S_IWRITE)
+        function(failed_path)
+    if os.path.exists(path):
+        shutil.rmtree(path, onerror=make_writable)
+
+
+class BlobStore:
+    """Content-addressed store that keeps each distinct generated file once, under its SHA-256
+
+    An artifact is described by a manifest of (path, hash, size) entries keyed by the SHA-256
+    of its ZIP, so previews and extracted projects are materialised as hardlinks to the stored
+    blobs instead of fresh copies. Blobs are read-only because every link shares them.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.manifests_dir = os.path.join(root, 'manifests')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def manifest_path(self, key):
+        return os.path.join(self.manifests_dir, f"{key}.json")
+
+    def put(self, data):
+        """Store bytes once and return their hash"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        try:
+            # A blob that is stored again is in use; the garbage collector keeps recent blobs
+            os.utime(path)
+        except FileNotFoundError:
+            _write_atomic(path, data, 0o444)
+        return digest
+
+    def write_manifest(self, key, entries):
+        """Record the (path, hash, size) entries of an artifact"""
+        manifest = [{'path': path, 'hash': digest, 'size': size} for path, digest, size in entries]
+        _write_atomic(self.manifest_path(key), json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+
+    def read_manifest(self, key):
+        try:
+            with open(self.manifest_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def add_archive(self, zip_path):
+        """Store the members of a ZIP and return its manifest key, skipping archives seen before"""
+        key = file_digest(zip_path)
+        if os.path.exists(self.manifest_path(key)):
+            return key
+        entries = []
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                data = archive.read(info)
+                entries.append((info.filename, self.put(data), len(data)))
+        self.write_manifest(key, entries)
+        return key
+
+    def materialise(self, key, target_dir):
+        """Recreate an artifact's files under target_dir as hardlinks to the stored blobs
+
+        Falls back to copying where hardlinks are unavailable, e.g. across filesystems.
+        """
+        manifest = self.read_manifest(key)
+        if manifest is None:
+            raise KeyError(f"No manifest for artifact {key}")
+        root = os.path.realpath(target_dir)
+        for entry in manifest:
+            destination = os.path.realpath(os.path.join(root, entry['path']))
+            # Same guard as zipfile.extractall: never write outside target_dir
+            if not destination.startswith(root + os.sep):
+                raise ValueError(f"Unsafe path in manifest: {entry['path']}")
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            source = self.object_path(entry['hash'])
+            try:
+                os.link(source, destination)
+            except OSError:
+                shutil.copyfile(source, destination)
+        return manifest
+
+    def checkout(self, key, parent_dir):
+        """Materialise an artifact into its own versioned directory parent_dir/<hash prefix>
+
+        A version is built in a staging directory and renamed into place, so it is never seen
+        half-written. Once it exists it is only ever read, and concurrent callers share it
+        instead of deleting and re-extracting each other's files.
+        """
+        target = os.path.join(parent_dir, key[:16])
+        if os.path.isdir(target):
+            return target
+        os.makedirs(parent_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent_dir, prefix='.tmp-')
+        try:
+            self.materialise(key, staging)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # Another request published the same version first
+                if not os.path.isdir(target):
+                    raise
+        finally:
+            remove_tree(staging)
+        return target
+
+    def stats(self):
+        """Count stored blobs and manifests and the bytes they take up"""
+        blobs = 0
+        blob_bytes = 0
+        for directory, _, names in os.walk(self.objects_dir):
+            for name in names:
+                if not name.startswith('.tmp-'):
+                    blobs += 1
+                    blob_bytes += os.path.getsize(os.path.join(directory, name))
+        manifests = sum(1 for name in os.listdir(self.manifests_dir) if name.endswith('.json'))
+        return {'blobs': blobs, 'bytes': blob_bytes, 'manifests': manifests}
@@ -4,7 +4,7 @@ Example usage of the Research Paper Agent
 This demonstrates how to use the agent to process a PDF and generate a MERN stack application
 """
 
-from agent import research_agent
+from paper_agent import PipelineContext, research_agent
 import os
 
 def main():
@@ -55,7 +55,9 @@ def main():
     download_path = os.path.join(os.getcwd(), "downloads")
     os.makedirs(download_path, exist_ok=True)
     
-    zip_path = research_agent.create_zip_file("research-app", download_path)
+    # The ZIP is written from this run's own context; the agent itself keeps no state
+    context = PipelineContext("research-app", "MERN Stack", content, project_structure, concepts, generated_code)
+    zip_path = research_agent.create_zip_file(context, download_path)
     
     if zip_path.startswith("Error"):
         print(f"Error: {zip_path}")
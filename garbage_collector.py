@@ -0,0 +1,365 @@
+import os
+import json
+import time
+import threading
+from archive import ARCHIVE_FORMATS
+from blob_store import remove_tree
+from paper_agent import MANIFEST_SUFFIX
+from upload_store import TEXT_SUFFIX
+
+try:
+    import fcntl
+except ImportError:
+    # Without fcntl (Windows) the server is a single process, which always collects
+    fcntl = None
+
+DAY = 24 * 60 * 60
+
+# How long each kind of artifact is kept after it was last used, in seconds
+DEFAULT_TTLS = {
+    'uploads': 7 * DAY,
+    'archives': 7 * DAY,
+    'previews': DAY,
+    'extracted': DAY,
+    # Chunked uploads that were never finalised
+    'partial': DAY,
+}
+
+ARCHIVE_EXTENSIONS = tuple(spec['extension'] for spec in ARCHIVE_FORMATS.values())
+
+# Uploaded PDFs are stored by content hash in this subfolder (see upload_store.UploadStore)
+PDF_FOLDER = 'pdfs'
+# Chunked uploads in progress, one directory each (see upload_store.ResumableUploads)
+PARTIAL_FOLDER = 'partial'
+
+
+def mark_used(path):
+    """Record that an artifact was just used, so it is evicted last
+
+    An archive's last use is kept on its manifest sidecar, because the sidecar checks the
+    archive's own modification time.
+    """
+    sidecar = path + MANIFEST_SUFFIX
+    try:
+        os.utime(sidecar if os.path.exists(sidecar) else path)
+    except OSError:
+        pass
+
+
+def _reclaimable_bytes(path):
+    """Bytes that removing path would free: files that are not also linked from elsewhere"""
+    total = 0
+    if os.path.isdir(path):
+        paths = (os.path.join(directory, name) for directory, _, names in os.walk(path) for name in names)
+    else:
+        paths = [path]
+    for file_path in paths:
+        try:
+            stat = os.lstat(file_path)
+        except OSError:
+            continue
+        if stat.st_nlink <= 1:
+            total += stat.st_size
+    return total
+
+
+def _remove(path):
+    freed = _reclaimable_bytes(path)
+    if os.path.isdir(path):
+        remove_tree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+    return freed
+
+
+class ArtifactCollector:
+    """Evicts uploaded PDFs, archives, previews and extracted projects from the upload folder
+
+    Anything unused for longer than its kind's TTL is removed. When the folder is still over
+    `quota_bytes`, the least recently used artifacts of any kind go next. Nothing used within
+    `grace` seconds, and nothing `protected()` returns (e.g. the projects of running apps), is
+    ever removed. Blob store manifests and blobs that no remaining archive refers to are removed
+    with them, as are temporary files that outlived the grace period.
+    """
+
+    def __init__(self, upload_dir, blob_store=None, ttls=None, quota_bytes=0, grace=600, protected=None):
+        self.upload_dir = upload_dir
+        self.blob_store = blob_store
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.quota_bytes = quota_bytes
+        self.grace = grace
+        self.protected = protected or (lambda: [])
+        self.runs = 0
+        self.bytes_reclaimed = 0
+        self.last_run = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock_path = None
+        self._lock_file = None
+        # A process forked mid-collection must not inherit the held lock; its collector
+        # thread stays behind in the parent
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        # The parent keeps the designation; closing our copy leaves its lock held
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _last_used(self, path):
+        times = [os.stat(path).st_mtime]
+        if os.path.exists(path + MANIFEST_SUFFIX):
+            times.append(os.stat(path + MANIFEST_SUFFIX).st_mtime)
+        return max(times)
+
+    def items(self):
+        """List every evictable artifact as a dict of kind, path and last use"""
+        items = []
+        for name in os.listdir(self.upload_dir):
+            path = os.path.join(self.upload_dir, name)
+            if name.startswith('.') or not os.path.isfile(path):
+                continue
+            if name.lower().endswith('.pdf'):
+                items.append({'kind': 'uploads', 'path': path})
+            elif name.endswith(ARCHIVE_EXTENSIONS):
+                items.append({'kind': 'archives', 'path': path})
+        pdf_dir = os.path.join(self.upload_dir, PDF_FOLDER)
+        if os.path.isdir(pdf_dir):
+            items.extend({'kind': 'uploads', 'path': os.path.join(pdf_dir, name)}
+                         for name in os.listdir(pdf_dir) if name.lower().endswith('.pdf') and not name.startswith('.'))
+        partial_dir = os.path.join(self.upload_dir, PARTIAL_FOLDER)
+        if os.path.isdir(partial_dir):
+            items.extend({'kind': 'partial', 'path': os.path.join(partial_dir, name)} for name in os.listdir(partial_dir))
+        # Previews and extracted projects live in versioned directories, <kind>/<name>/<version>
+        for kind in ('previews', 'extracted'):
+            kind_dir = os.path.join(self.upload_dir, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for name in os.listdir(kind_dir):
+                project_dir = os.path.join(kind_dir, name)
+                if not os.path.isdir(project_dir):
+                    continue
+                for version in os.listdir(project_dir):
+                    if not version.startswith('.tmp-'):
+                        items.append({'kind': kind, 'path': os.path.join(project_dir, version)})
+        for item in items:
+            try:
+                item['last_used'] = self._last_used(item['path'])
+            except OSError:
+                # Removed by a request since it was listed
+                item['last_used'] = None
+        return [item for item in items if item['last_used'] is not None]
+
+    def _is_protected(self, path, protected):
+        path = os.path.abspath(path)
+        for kept in protected:
+            # A running app's directory may sit inside the version directory, or be the archive itself
+            if path == kept or kept.startswith(path + os.sep) or path.startswith(kept + os.sep):
+                return True
+        return False
+
+    def _evict(self, item, report):
+        freed = _remove(item['path'])
+        if item['kind'] == 'archives':
+            freed += _remove(item['path'] + MANIFEST_SUFFIX)
+        elif item['kind'] == 'uploads' and os.path.exists(item['path'] + TEXT_SUFFIX):
+            # A stored PDF's extracted text goes with it
+            freed += _remove(item['path'] + TEXT_SUFFIX)
+        elif item['kind'] in ('previews', 'extracted'):
+            # Drop the <kind>/<name> directory once its last version is gone
+            try:
+                os.rmdir(os.path.dirname(item['path']))
+            except OSError:
+                pass
+        report['removed'][item['kind']] = report['removed'].get(item['kind'], 0) + 1
+        report['bytes_reclaimed'] += freed
+        return freed
+
+    def _sweep_temporaries(self, now, report):
+        """Remove temporary files, staging directories and orphaned sidecars older than the grace period"""
+        roots = [self.upload_dir, os.path.join(self.upload_dir, PDF_FOLDER)]
+        for kind in ('previews', 'extracted'):
+            kind_dir = os.path.join(self.upload_dir, kind)
+            if os.path.isdir(kind_dir):
+                roots.extend(os.path.join(kind_dir, name) for name in os.listdir(kind_dir))
+        if self.blob_store is not None:
+            roots.append(self.blob_store.manifests_dir)
+        for root in roots:
+            if not os.path.isdir(root):
+                continue
+            for name in os.listdir(root):
+                path = os.path.join(root, name)
+                # Sidecars of archives and PDFs that were removed are left over too
+                suffix = MANIFEST_SUFFIX if root == self.upload_dir else TEXT_SUFFIX
+                orphan_sidecar = (root in (self.upload_dir, os.path.join(self.upload_dir, PDF_FOLDER))
+                                  and name.endswith(suffix) and not os.path.exists(path[:-len(suffix)]))
+                if not (name.startswith('.tmp-') or name.endswith('.partial') or orphan_sidecar):
+                    continue
+                try:
+                    if now - os.stat(path).st_mtime < self.grace:
+                        continue
+                except OSError:
+                    continue
+                report['bytes_reclaimed'] += _remove(path)
+                report['removed']['temporary'] = report['removed'].get('temporary', 0) + 1
+
+    def _sweep_blobs(self, now, report):
+        """Remove blob manifests no remaining archive refers to, then blobs no manifest refers to
+
+        Recent manifests and blobs are kept, since a build in progress writes its blobs, then
+        its manifest, then the archive's sidecar.
+        """
+        store = self.blob_store
+        if store is None:
+            return 0
+        live_keys = set()
+        for name in os.listdir(self.upload_dir):
+            if not name.endswith(MANIFEST_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(self.upload_dir, name), 'r', encoding='utf-8') as f:
+                    live_keys.add(json.load(f)['archive']['sha256'])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        freed = 0
+        live_blobs = set()
+        for name in os.listdir(store.manifests_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(store.manifests_dir, name)
+            try:
+                recent = now - os.stat(path).st_mtime < self.grace
+                if name[:-len('.json')] in live_keys or recent:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        live_blobs.update(entry['hash'] for entry in json.load(f))
+                    continue
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            freed += _remove(path)
+            report['removed']['manifests'] = report['removed'].get('manifests', 0) + 1
+        for directory, _, names in os.walk(store.objects_dir):
+            for name in names:
+                digest = os.path.basename(directory) + name
+                path = os.path.join(directory, name)
+                # Interrupted writes (.tmp-*) are never live either
+                if digest in live_blobs:
+                    continue
+                try:
+                    if now - os.stat(path).st_mtime < self.grace:
+                        continue
+                except OSError:
+                    continue
+                freed += _remove(path)
+                report['removed']['blobs'] = report['removed'].get('blobs', 0) + 1
+        report['bytes_reclaimed'] += freed
+        return freed
+
+    def disk_usage(self):
+        """Bytes used under the upload folder, counting hardlinked files once"""
+        seen = set()
+        total = 0
+        for directory, _, names in os.walk(self.upload_dir):
+            for name in names:
+                try:
+                    stat = os.lstat(os.path.join(directory, name))
+                except OSError:
+                    continue
+                if (stat.st_dev, stat.st_ino) not in seen:
+                    seen.add((stat.st_dev, stat.st_ino))
+                    total += stat.st_size
+        return total
+
+    def collect(self):
+        """Run one collection and return what it removed and how many bytes it reclaimed"""
+        with self._lock:
+            start = time.perf_counter()
+            now = time.time()
+            report = {'removed': {}, 'bytes_reclaimed': 0}
+            protected = [os.path.abspath(path) for path in self.protected()]
+            candidates = []
+            for item in self.items():
+                age = now - item['last_used']
+                if age < self.grace or self._is_protected(item['path'], protected):
+                    continue
+                if age > self.ttls.get(item['kind'], float('inf')):
+                    self._evict(item, report)
+                else:
+                    candidates.append(item)
+            self._sweep_temporaries(now, report)
+            self._sweep_blobs(now, report)
+
+            usage = self.disk_usage()
+            if self.quota_bytes and usage > self.quota_bytes:
+                # Over quota: least recently used first, whatever its kind
+                for item in sorted(candidates, key=lambda item: item['last_used']):
+                    if usage <= self.quota_bytes:
+                        break
+                    usage -= self._evict(item, report)
+                    if item['kind'] == 'archives':
+                        # Its blobs are only freed once no manifest refers to them
+                        usage -= self._sweep_blobs(now, report)
+                usage = self.disk_usage()
+
+            report['usage_bytes'] = usage
+            report['quota_bytes'] = self.quota_bytes
+            report['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            self.runs += 1
+            self.bytes_reclaimed += report['bytes_reclaimed']
+            self.last_run = dict(report, finished_at=time.time())
+            return report
+
+    def _designated(self):
+        """Whether this process is the one that collects, taking the lock file if it is free"""
+        if self._lock_path is None or fcntl is None or self._lock_file is not None:
+            return True
+        lock_file = open(self._lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Held for the life of the process; the lock is released when it exits
+        self._lock_file = lock_file
+        return True
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                if not self._designated():
+                    continue
+                report = self.collect()
+                if report['removed']:
+                    print(f"Garbage collection reclaimed {report['bytes_reclaimed']} bytes: {report['removed']}")
+            except Exception as e:
+                print(f"Garbage collection error: {e}")
+
+    def start(self, interval, lock_path=None):
+        """Collect every `interval` seconds on a daemon thread
+
+        With a `lock_path`, only the process holding an exclusive lock on that file collects,
+        so one of several server processes sharing the folder does; the others keep trying
+        and one of them takes over when that process exits. Start the thread after forking:
+        it does not follow the process into a forked child.
+        """
+        self._lock_path = lock_path
+        if self._thread is None and interval > 0:
+            self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True,
+                                            name='artifact-gc')
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            'runs': self.runs,
+            'bytes_reclaimed': self.bytes_reclaimed,
+            'last_run': self.last_run,
+            'ttls': self.ttls,
+            'quota_bytes': self.quota_bytes
+        }
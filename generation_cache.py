@@ -0,0 +1,121 @@
+import os
+import json
+import marshal
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and total size in bytes"""
+
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        # Entries that could never fit are not worth evicting everything else for
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+
+
+def _files_size(files):
+    return sum(len(json.dumps(content)) if isinstance(content, dict) else len(content)
+               for content in files.values())
+
+
+def _copy_files(files):
+    # package.json style entries are dicts; hand out fresh copies so callers can't corrupt the cache
+    return {path: marshal.loads(marshal.dumps(content)) if isinstance(content, dict) else content
+            for path, content in files.items()}
+
+
+class GenerationCache:
+    """Memoises rendered file maps and finished ZIP bytes per (stack, project name, concepts)"""
+
+    def __init__(self, max_entries=128, max_bytes=32 * 1024 * 1024,
+                 zip_max_entries=64, zip_max_bytes=64 * 1024 * 1024):
+        self.files = LRUCache(max_entries, max_bytes)
+        self.zips = LRUCache(zip_max_entries, zip_max_bytes)
+
+    @staticmethod
+    def key(stack, project_name, concepts):
+        """Build a cache key from the inputs that generation actually reads"""
+        # A plain tuple hashes far faster than serialising and digesting the concepts
+        return (stack, project_name,
+                tuple(concepts.get('features', [])), tuple(concepts.get('keywords', [])[:10]))
+
+    def get_files(self, key):
+        files = self.files.get(key)
+        return _copy_files(files) if files is not None else None
+
+    def put_files(self, key, files):
+        self.files.put(key, _copy_files(files), _files_size(files))
+
+    def get_zip(self, key):
+        return self.zips.get(key)
+
+    def put_zip(self, key, entry):
+        """Cache (zip bytes, member names, stats, (path, hash, size) entries) for a key"""
+        data, names, stats, entries = entry
+        self.zips.put(key, (data, list(names), dict(stats), list(entries)),
+                      len(data) + sum(len(name) for name in names) + 96 * len(entries))
+
+    def clear(self):
+        self.files.clear()
+        self.zips.clear()
+
+    def stats(self):
+        return {'files': self.files.stats(), 'zips': self.zips.stats()}
+
+
+generation_cache = GenerationCache(
+    max_entries=int(os.environ.get('GENERATION_CACHE_ENTRIES', 128)),
+    max_bytes=int(os.environ.get('GENERATION_CACHE_BYTES', 32 * 1024 * 1024)),
+    zip_max_entries=int(os.environ.get('ZIP_CACHE_ENTRIES', 64)),
+    zip_max_bytes=int(os.environ.get('ZIP_CACHE_BYTES', 64 * 1024 * 1024))
+)
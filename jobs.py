@@ -0,0 +1,345 @@
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from blob_store import _write_atomic
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+# 'progress' events reach the state file at most this often (seconds); stage changes at once
+SAVE_INTERVAL = float(os.environ.get('JOB_SAVE_INTERVAL', 0.25))
+
+# How often each process looks for old state files of finished jobs to remove (seconds)
+TRIM_INTERVAL = 60
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue already holds its maximum"""
+
+
+class Job:
+    """One queued unit of work, the progress events it reported and, once it finishes, its outcome
+
+    Events are dicts with a sequence number `seq`, a `stage`, a `state` ('started', 'progress',
+    'finished' or 'failed') and `elapsed_ms` since the job was created; 'finished' events also
+    carry the stage's own `stage_ms`. The last event has stage 'job' and the final status as
+    its state.
+    """
+
+    def __init__(self, kind, args=(), state_path=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.args = args
+        # Jobs of other processes are read back from their state file and are not live
+        self.state_path = state_path
+        self.live = True
+        # The server process running the job
+        self.pid = os.getpid()
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.status_code = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        self.timings = {}
+        self._stage_starts = {}
+        self._changed = threading.Condition()
+        self._save_lock = threading.Lock()
+        self._saved_at = 0.0
+        self._saved_events = -1
+
+    def progress(self, stage, state, **details):
+        """Record a stage event; details such as pages done or the technology are passed through"""
+        now = time.time()
+        event = dict(details, stage=stage, state=state, elapsed_ms=round((now - self.created_at) * 1000, 2))
+        with self._changed:
+            # Stages of a fan-out upload run once per technology
+            key = f"{stage}:{details['technology']}" if 'technology' in details else stage
+            if state == 'started':
+                self._stage_starts[key] = now
+            elif state == 'finished' and key in self._stage_starts:
+                event['stage_ms'] = round((now - self._stage_starts.pop(key)) * 1000, 2)
+                self.timings[key] = event['stage_ms']
+            event['seq'] = len(self.events)
+            self.events.append(event)
+            # Rewriting the state file for every page of a long PDF would cost time quadratic in the events
+            due = self.state_path is not None and (state != 'progress' or now - self._saved_at >= SAVE_INTERVAL)
+            if due:
+                self._saved_at = now
+                snapshot = self._snapshot()
+            self._changed.notify_all()
+        if due:
+            self._write(snapshot)
+
+    def _snapshot(self):
+        return dict(self.to_dict(), args=list(self.args), events=list(self.events), pid=self.pid)
+
+    def _write(self, snapshot):
+        # Writers race once they leave the condition; never let an older snapshot replace a newer one
+        with self._save_lock:
+            if len(snapshot['events']) > self._saved_events:
+                _write_atomic(self.state_path, json.dumps(snapshot).encode('utf-8'))
+                self._saved_events = len(snapshot['events'])
+
+    def save(self):
+        """Write the job and its events to its state file, if it has one"""
+        if self.state_path is not None:
+            with self._changed:
+                snapshot = self._snapshot()
+            self._write(snapshot)
+
+    @classmethod
+    def load(cls, state_path):
+        """Read a job another process saved; returns None if it has no readable state file
+
+        A job whose process exited before finishing it (e.g. a killed worker) is failed, and
+        saved as failed, so it never stays running.
+        """
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        job = cls(data['kind'], tuple(data.get('args', ())))
+        for field in ('id', 'status', 'created_at', 'started_at', 'finished_at', 'timings', 'error', 'result',
+                      'events'):
+            setattr(job, field, data.get(field, getattr(job, field)))
+        # State files written before owners were recorded have no pid
+        job.pid = data.get('pid')
+        job.live = False
+        if job.finished_at is None and job.pid is not None and not process_alive(job.pid):
+            job._abandoned(state_path)
+        return job
+
+    def _abandoned(self, state_path):
+        try:
+            # The last time its process wrote anything
+            self.finished_at = os.stat(state_path).st_mtime
+        except OSError:
+            self.finished_at = time.time()
+        self.status = 'failed'
+        self.error = 'The server process running this job exited before it finished'
+        self.events.append({'stage': 'job', 'state': 'failed', 'seq': len(self.events),
+                            'elapsed_ms': round((self.finished_at - self.created_at) * 1000, 2)})
+        self.state_path = state_path
+        self.save()
+        self.state_path = None
+
+    def wait_events(self, since, timeout=None):
+        """Return the events from sequence number `since` on, waiting up to `timeout` for one"""
+        with self._changed:
+            if len(self.events) <= since:
+                self._changed.wait(timeout)
+            return self.events[since:]
+
+    def to_dict(self):
+        data = {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'timings': dict(self.timings)
+        }
+        if self.status == 'failed':
+            data['error'] = self.error
+        if self.result is not None:
+            data['result'] = self.result
+        return data
+
+
+class JobQueue:
+    """Runs submitted functions on a bounded thread pool and keeps their outcome for polling
+
+    Threads rather than processes, so jobs share the in-memory template, generation and
+    validation caches. At most `max_pending` jobs may be queued or running; further
+    submissions raise QueueFull. The `max_finished` most recent finished jobs are kept.
+
+    A job function is called with `progress=job.progress` and returns (payload, status_code).
+    Codes below 400 mark it succeeded, other codes mark it failed with payload['error'] as
+    the message.
+
+    With a `state_dir`, each job is also saved to <state_dir>/<id>.json as it progresses, so
+    when several server processes share the directory any of them can answer for any job.
+    Any of them also removes state files of jobs that finished over `max_age` seconds ago.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, max_finished=256, state_dir=None, max_age=24 * 60 * 60):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        # With a state directory, every server process can report on every job
+        self.state_dir = state_dir
+        if state_dir is not None:
+            os.makedirs(state_dir, exist_ok=True)
+        self.max_age = max_age
+        self._trimmed_at = 0.0
+        self.max_jobs = 0
+        self.on_retire = None
+        self._started = 0
+        self._jobs = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+    def _state_path(self, job_id):
+        return os.path.join(self.state_dir, f"{job_id}.json") if self.state_dir is not None else None
+
+    def retire_after(self, max_jobs, on_retire):
+        """Call on_retire() once max_jobs jobs have been started, e.g. to recycle a worker process"""
+        self.max_jobs = max_jobs
+        self.on_retire = on_retire
+
+    def create(self, kind, *args):
+        """Reserve a queue slot for a job that is started later, e.g. once its input is saved"""
+        job = Job(kind, args)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} jobs are already queued or running")
+            self._pending += 1
+            self._jobs[job.id] = job
+        job.state_path = self._state_path(job.id)
+        job.save()
+        return job
+
+    def start(self, job, func):
+        self._pool.submit(self._run, job, func)
+        with self._lock:
+            self._started += 1
+            retire = self.max_jobs and self._started == self.max_jobs
+        if retire and self.on_retire is not None:
+            self.on_retire()
+
+    def submit(self, kind, func, *args):
+        job = self.create(kind, *args)
+        self.start(job, func)
+        return job
+
+    def abandon(self, job, error):
+        """Fail a created job that will never be started"""
+        self._finish(job, {'error': error}, 500)
+
+    def _run(self, job, func):
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            payload, status_code = func(*job.args, progress=job.progress)
+        except Exception as e:
+            payload, status_code = {'error': f'Processing error: {str(e)}'}, 500
+        self._finish(job, payload, status_code)
+
+    def _finish(self, job, payload, status_code):
+        job.status_code = status_code
+        job.result = payload
+        if status_code >= 400:
+            job.error = payload.get('error', 'Job failed')
+        job.finished_at = time.time()
+        job.status = 'succeeded' if status_code < 400 else 'failed'
+        # The final event also saves the finished job
+        job.progress('job', job.status)
+        with self._lock:
+            self._pending -= 1
+            self._trim()
+            if self._pending == 0:
+                self._idle.notify_all()
+        self._trim_stored()
+
+    def wait_idle(self, timeout=None):
+        """Block until no job is queued or running; returns False if `timeout` ran out first"""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def drain(self):
+        """Finish every queued and running job, then stop the pool
+
+        Call this before the interpreter starts shutting down: from then on the executors the
+        jobs themselves use refuse new work.
+        """
+        self.wait_idle()
+        self._pool.shutdown(wait=True)
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+            if self.state_dir is not None:
+                try:
+                    os.remove(self._state_path(job_id))
+                except OSError:
+                    pass
+
+    def _trim_stored(self):
+        """Remove state files of jobs that finished over `max_age` seconds ago, whichever process ran them
+
+        Runs at most every TRIM_INTERVAL seconds. Only files not written for `max_age` are read.
+        """
+        now = time.time()
+        if self.state_dir is None or now - self._trimmed_at < TRIM_INTERVAL:
+            return
+        self._trimmed_at = now
+        cutoff = now - self.max_age
+        for name in os.listdir(self.state_dir):
+            path = os.path.join(self.state_dir, name)
+            if not (name.endswith('.json') and JOB_ID_PATTERN.match(name[:-len('.json')])):
+                continue
+            try:
+                if os.stat(path).st_mtime > cutoff:
+                    continue
+            except OSError:
+                continue
+            job = Job.load(path)
+            if job is not None and job.finished_at is not None and job.finished_at <= cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def get(self, job_id):
+        """Return a job of this process, or a snapshot of another process's job from its state file"""
+        job = self._jobs.get(job_id)
+        if job is None and self.state_dir is not None and JOB_ID_PATTERN.match(job_id):
+            job = Job.load(self._state_path(job_id))
+        return job
+
+    def stored(self):
+        """Snapshots of every job in the state directory, whichever process runs it"""
+        if self.state_dir is None:
+            return self.list()
+        self._trim_stored()
+        jobs = []
+        for name in os.listdir(self.state_dir):
+            if JOB_ID_PATTERN.match(name[:-len('.json')]) and name.endswith('.json'):
+                job = self._jobs.get(name[:-len('.json')]) or Job.load(os.path.join(self.state_dir, name))
+                if job is not None:
+                    jobs.append(job)
+        return jobs
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {'workers': self.max_workers, 'pending': self._pending,
+                    'max_pending': self.max_pending, 'jobs': counts}
@@ -0,0 +1,629 @@
+import os
+import json
+import re
+import hashlib
+import heapq
+import time
+import tempfile
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+import stacks
+from template_registry import template_registry, encode_content
+from archive import ARCHIVE_FORMATS, ZipArchiveSink, read_raw_member, stream_tar, stream_zip, write_archive, write_zip
+from generation_cache import generation_cache
+from validation import file_validator
+from publishing import publish
+from blob_store import file_digest
+
+# Files written next to the generated code when building the ZIP
+ADDITIONAL_FILES = {
+    "frontend/src/index.js": "mern/frontend/src/index.js.tmpl",
+    "frontend/public/index.html": "mern/frontend/public/index.html.tmpl",
+    "frontend/src/styles/App.css": "mern/frontend/src/styles/App.css.tmpl",
+}
+
+class InvalidFiles(Exception):
+    """Raised to abandon an archive whose generated files failed validation"""
+
+    def __init__(self, invalid):
+        super().__init__(f"{len(invalid)} invalid file(s)")
+        self.invalid = invalid
+
+
+# Files that declare a project's third-party dependencies
+DEPENDENCY_FILES = ('package.json', 'composer.json', 'requirements.txt', 'Gemfile', 'pom.xml')
+
+# Threads building the stacks of one fan-out upload. Generation is CPU-bound Python, so under the
+# GIL more than one only pays off when builds wait on I/O, e.g. a slow or network file system
+FANOUT_WORKERS = int(os.environ.get('FANOUT_WORKERS', 1))
+
+# Archives carry a JSON sidecar listing their files, e.g. project.zip.manifest.json
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def count_dependencies(path, data):
+    """Count the third-party dependencies declared by a generated file (0 for other files)"""
+    name = os.path.basename(path)
+    if name not in DEPENDENCY_FILES:
+        return 0
+    text = data.decode('utf-8')
+    if name in ('package.json', 'composer.json'):
+        manifest = json.loads(text)
+        return sum(len(manifest.get(section, {}))
+                   for section in ('dependencies', 'devDependencies', 'require', 'require-dev'))
+    if name == 'requirements.txt':
+        return sum(1 for line in text.splitlines() if line.strip() and not line.startswith('#'))
+    if name == 'Gemfile':
+        return sum(1 for line in text.splitlines() if line.strip().startswith('gem '))
+    return text.count('<dependency>')
+
+def source_prefix(project_name, source_sha256):
+    """Archive name prefix for a project built from one paper, e.g. research-app-3f2a9c1b7d4e
+
+    Archives are named <prefix>-<stack>, so papers that share a project name (two uploads
+    called paper.pdf, say) never overwrite each other's archives.
+    """
+    return f"{project_name}-{source_sha256[:12]}"
+
+
+def regenerated_name(zip_path, metadata, project_name):
+    """Name (without extension) for an artifact regenerated from zip_path under project_name
+
+    The source's name is kept apart from its project name part, which keeps a fan-out
+    artifact's -<stack> suffix (and any hash) in place.
+    """
+    source_name = os.path.basename(zip_path)[:-len('.zip')]
+    if source_name == metadata['project_name'] or source_name.startswith(metadata['project_name'] + '-'):
+        return project_name + source_name[len(metadata['project_name']):]
+    if project_name == metadata['project_name']:
+        return source_name
+    suffix = f"-{metadata['stack']}"
+    return project_name + (suffix if source_name.endswith(suffix) else '')
+
+
+class PipelineContext(namedtuple('PipelineContext', ('project_name', 'technology', 'content', 'project_structure',
+                                                     'concepts', 'generated_code', 'error', 'source_sha256'))):
+    """Everything one run of the pipeline read and produced, from the PDF text to the generated code
+
+    Contexts are immutable: each stage returns a new one with its results filled in (see
+    ResearchPaperAgent.run_pipeline), and the generated code is a read-only mapping. Runs
+    never share state, so any number of them can go through the one agent at the same time.
+    `source_sha256` is the SHA-256 of the paper the run started from, when there was one.
+    """
+    __slots__ = ()
+
+    def __new__(cls, project_name="research-app", technology="MERN Stack", content="", project_structure=None,
+                concepts=None, generated_code=None, error=None, source_sha256=None):
+        return super().__new__(cls, project_name, technology, content, project_structure or {}, concepts or {},
+                               MappingProxyType(dict(generated_code or {})), error, source_sha256)
+
+    @property
+    def artifact_name(self):
+        """File name (without extension) for this run's archive, e.g. research-app-3f2a9c1b7d4e-mern
+
+        Runs from different papers or for different stacks get different names even when they
+        share a project name, so they never overwrite each other's archive.
+        """
+        if not self.source_sha256:
+            return self.project_name
+        return f"{source_prefix(self.project_name, self.source_sha256)}-{stacks.stack_key(self.technology)}"
+
+    def evolve(self, **changes):
+        """Return a copy of this context with some fields replaced"""
+        return PipelineContext(**dict(self._asdict(), **changes))
+
+
+class ResearchPaperAgent:
+    """Extracts, analyses, generates and archives research paper projects
+
+    The agent keeps no per-request state; everything a run needs is passed in, or carried
+    in its PipelineContext, so one instance is shared by every request and thread.
+    """
+
+    def run_pipeline(self, pdf_path=None, technology="MERN Stack", project_name="research-app", content=None):
+        """Extract (unless `content` is given), analyse and generate one project; returns its PipelineContext
+
+        A failed stage is reported in the returned context's `error` and ends the run there.
+        """
+        context = PipelineContext(project_name, technology)
+        if content is None:
+            try:
+                context = context.evolve(source_sha256=file_digest(pdf_path))
+            except OSError as e:
+                return context.evolve(error=f"Error reading PDF: {str(e)}")
+            content = self.extract_pdf_content(pdf_path)
+            if content.startswith("Error"):
+                return context.evolve(error=content)
+        else:
+            context = context.evolve(source_sha256=hashlib.sha256(content.encode('utf-8')).hexdigest())
+        project_structure, concepts = self.analyze_content_and_generate_structure(content)
+        context = context.evolve(content=content, project_structure=project_structure, concepts=concepts)
+        generated_code = self.generate_code_for_technology(concepts, project_name, technology)
+        if 'error' in generated_code:
+            return context.evolve(error=generated_code['error'])
+        return context.evolve(generated_code=generated_code)
+        
+    def extract_pdf_content(self, pdf_path, on_page=None):
+        """Extract text content from PDF file; on_page(pages_done, pages_total) is called after each page"""
+        try:
+            # pdfplumber pulls in pdfminer and Pillow, so only import it once a PDF actually arrives
+            import pdfplumber
+            
+            content = ""
+            with pdfplumber.open(pdf_path) as pdf:
+                for number, page in enumerate(pdf.pages, 1):
+                    page_text = page.extract_text()
+                    if page_text:
+                        content += page_text + "\n"
+                    if on_page is not None:
+                        on_page(number, len(pdf.pages))
+            
+            return content
+        except Exception as e:
+            return f"Error extracting PDF: {str(e)}"
+    
+    def analyze_content_and_generate_structure(self, content):
+        """Analyze research paper content and generate MERN stack project structure"""
+        # Extract key concepts and requirements from the research paper
+        concepts = self.extract_key_concepts(content)
+        
+        # Generate project structure based on analysis
+        project_structure = {
+            "backend": {
+                "package.json": "Node.js backend package configuration",
+                "server.js": "Express server setup",
+                "models/": "MongoDB models directory",
+                "routes/": "API routes directory",
+                "controllers/": "Business logic controllers",
+                "middleware/": "Custom middleware",
+                "config/": "Database and app configuration",
+                ".env": "Environment variables"
+            },
+            "frontend": {
+                "package.json": "React frontend package configuration",
+                "public/": "Static assets",
+                "src/": {
+                    "components/": "React components",
+                    "pages/": "Page components",
+                    "services/": "API service calls",
+                    "utils/": "Utility functions",
+                    "styles/": "CSS/styling files",
+                    "App.js": "Main App component",
+                    "index.js": "React entry point"
+                }
+            },
+            "database": {
+                "models/": "MongoDB schemas and models",
+                "seeders/": "Database seed data"
+            }
+        }
+        
+        return project_structure, concepts
+    
+    def extract_key_concepts(self, content):
+        """Extract key concepts, features, and requirements from research paper"""
+        # Simple keyword extraction and analysis
+        keywords = re.findall(r'\b[A-Z][a-z]+\b', content)
+        technical_terms = re.findall(r'\b(?:API|database|authentication|user|admin|dashboard|analytics|reporting|management|system)\b', content, re.IGNORECASE)
+        
+        # Extract potential features based on common patterns
+        features = []
+        if 'user' in content.lower():
+            features.append('User Management')
+        if 'authentication' in content.lower() or 'login' in content.lower():
+            features.append('Authentication System')
+        if 'dashboard' in content.lower():
+            features.append('Dashboard')
+        if 'analytics' in content.lower() or 'report' in content.lower():
+            features.append('Analytics & Reporting')
+        if 'admin' in content.lower():
+            features.append('Admin Panel')
+        
+        return {
+            # Deduplicated in order of appearance: a set's order changes with the hash seed, and
+            # with it the generated files of every run in another process
+            'keywords': list(dict.fromkeys(keywords))[:20],  # First 20 unique keywords
+            'technical_terms': list(dict.fromkeys(technical_terms)),
+            'features': features,
+            'content_length': len(content)
+        }
+    
+    def generate_mern_code(self, concepts, project_name="research-app"):
+        """Generate MERN stack code files based on extracted concepts"""
+        return stacks.load_plugin("MERN Stack").generate(concepts, project_name)
+    
+    def create_zip_file(self, context, download_path=None):
+        """Create <artifact_name>.zip from a PipelineContext's generated code and return the local path"""
+        try:
+            zip_path = os.path.join(download_path or tempfile.gettempdir(), f"{context.artifact_name}.zip")
+            with publish(zip_path) as temp_path:
+                self.write_project_zip(temp_path, context.generated_code)
+            return zip_path
+            
+        except Exception as e:
+            return f"Error creating ZIP file: {str(e)}"
+    
+    def write_project_zip(self, target, generated_code):
+        """Zip generated code plus the additional files into a path or binary file object (e.g. BytesIO)
+
+        Members are written straight from memory; nothing is staged on disk.
+        """
+        files = ((path, encode_content(content)) for path, content in generated_code.items()
+                 # The additional files replace generated files with the same path
+                 if path not in ADDITIONAL_FILES)
+        return write_zip(target, heapq.merge(files, self._create_additional_files(), key=lambda item: item[0]))
+    
+    def _create_additional_files(self):
+        """Yield (path, bytes) for the additional files every generated frontend needs, in path order"""
+        for relative_path, template_name in sorted(ADDITIONAL_FILES.items()):
+            yield relative_path, template_registry.render_bytes(template_name, {})
+
+    def generate_code_for_technology(self, concepts, project_name, technology, rendered=None):
+        """Generate code based on the specified technology stack"""
+        try:
+            # Unknown technologies fall back to the default (MERN) stack
+            stack = stacks.stack_key(technology)
+            cache_key = generation_cache.key(stack, project_name, concepts)
+            generated_code = generation_cache.get_files(cache_key)
+            if generated_code is None:
+                generated_code = stacks.load_plugin(technology).generate(concepts, project_name, rendered)
+                generation_cache.put_files(cache_key, generated_code)
+            return generated_code
+        except Exception as e:
+            return {"error": f"Error generating {technology} code: {str(e)}"}
+
+    def iter_project_files(self, concepts, project_name, technology, rendered=None):
+        """Yield (path, bytes) for every file of a generated project, additional files included"""
+        plugin = stacks.load_plugin(technology)
+        # The additional files replace generated files with the same path, as in create_zip_file
+        files = ((path, data) for path, data in plugin.iter_files(concepts, project_name, rendered)
+                 if path not in ADDITIONAL_FILES)
+        # Both sources come in path order, so merging them renders one file at a time while keeping
+        # members sorted (plus fixed timestamps, identical projects zip to identical bytes)
+        yield from heapq.merge(files, self._create_additional_files(), key=lambda item: item[0])
+
+    def _project_templates(self, stack, concepts, project_name):
+        """Return the render context and (path, template) pairs that make up a generated project"""
+        context, templates = template_registry.plan(stack, concepts, project_name)
+        pairs = [(path, template) for path, template in templates if path not in ADDITIONAL_FILES]
+        pairs += [(path, template_registry.get(name)) for path, name in ADDITIONAL_FILES.items()]
+        return context, sorted(pairs, key=lambda pair: pair[0])
+
+    def _artifact_metadata(self, stack, project_name, concepts):
+        """Describe the inputs of an artifact and which inputs each of its files depends on"""
+        context, templates = self._project_templates(stack, concepts, project_name)
+        return {
+            'generator': 'research-paper-agent',
+            'stack': stack,
+            'project_name': project_name,
+            'concepts': {
+                'features': list(concepts.get('features', [])),
+                'keywords': list(concepts.get('keywords', [])[:10])
+            },
+            'modules': context['modules'].split(',') if context['modules'] else [],
+            'dependencies': {path: sorted(template.slots) for path, template in templates}
+        }
+
+    def build_artifact(self, concepts, project_name, technology, output_dir, zip_name=None, rendered=None,
+                       store=None, archive_format='zip', progress=None):
+        """Generate one stack and archive it into output_dir, reusing cached archive bytes when possible
+
+        `archive_format` is one of archive.ARCHIVE_FORMATS. Every archive gets a manifest
+        sidecar (see read_artifact_manifest). With a BlobStore, the generated files of a ZIP are
+        also stored by content hash and the artifact's manifest is recorded under the hash of the ZIP.
+
+        `progress(stage, state, **details)` is told when the 'generate' and 'zip' stages start
+        and finish. Files are compressed as they are generated, so 'generate' includes their
+        compression and 'zip' covers finishing, checking and publishing the archive.
+        """
+        progress = progress or _ignore_progress
+        stack = stacks.resolve(technology)
+        zip_name = zip_name or project_name
+        zip_path = os.path.join(output_dir, f"{zip_name}{ARCHIVE_FORMATS[archive_format]['extension']}")
+        cache_key = generation_cache.key(stack['module'], project_name, concepts) + (archive_format,)
+        if archive_format != 'zip':
+            # Blob manifests describe ZIPs, which previews and runs extract
+            store = None
+        
+        try:
+            start = time.perf_counter()
+            progress('generate', 'started', technology=stack['id'])
+            cached = generation_cache.get_zip(cache_key)
+            if cached is not None:
+                # Identical inputs were archived before; the archive is just a copy
+                zip_bytes, project_structure, stats, entries = cached
+                progress('generate', 'finished', technology=stack['id'], files=stats['files'], cached=True)
+                progress('zip', 'started', technology=stack['id'])
+                with publish(zip_path) as temp_path:
+                    with open(temp_path, 'wb') as f:
+                        f.write(zip_bytes)
+                    manifest = artifact_manifest(temp_path, zip_bytes, entries)
+                if store is not None:
+                    store.add_archive(zip_path)
+            else:
+                # Files go from the templates straight into the archive, one at a time
+                # The archive comment records the generation inputs for incremental regeneration
+                metadata = self._artifact_metadata(stack['module'], project_name, concepts)
+                stats = {'format': archive_format, 'modules': metadata['modules'],
+                         'files': 0, 'bytes': 0, 'dependencies': 0}
+                files = self._counted(self.iter_project_files(concepts, project_name, stack['id'], rendered), stats)
+                files = self._reported(files, progress, stack['id'])
+                # Files are syntax-checked on the validator's pool while the archive is written
+                checks = []
+                files = self._validated(files, checks)
+                # Every file's path, hash and size go into the artifact's manifest sidecar
+                entries = []
+                files = self._catalogued(files, entries, store)
+                # The archive is built under a unique temporary name and renamed into place only
+                # once it is complete and valid, so concurrent readers never see a partial file
+                with publish(zip_path) as temp_path:
+                    project_structure = write_archive(
+                        temp_path, files, archive_format, json.dumps(metadata, separators=(',', ':')).encode('utf-8'))
+                    invalid = [(path, future.result()) for path, future in checks if future.result()]
+                    if invalid:
+                        raise InvalidFiles(invalid)
+                    with open(temp_path, 'rb') as f:
+                        zip_bytes = f.read()
+                    manifest = artifact_manifest(temp_path, zip_bytes, entries)
+                    if store is not None:
+                        store.write_manifest(manifest['archive']['sha256'], entries)
+                stats['archive_bytes'] = len(zip_bytes)
+                generation_cache.put_zip(cache_key, (zip_bytes, project_structure, stats, entries))
+            write_artifact_manifest(zip_path, manifest)
+            progress('zip', 'finished', technology=stack['id'], archive_bytes=len(zip_bytes))
+        except InvalidFiles as e:
+            progress('zip', 'failed', technology=stack['id'])
+            return self._validation_error(stack['id'], e.invalid)
+        except Exception as e:
+            progress('zip', 'failed', technology=stack['id'])
+            return {'technology': stack['id'], 'error': f"Error creating {archive_format} archive: {str(e)}"}
+        
+        return {
+            'technology': stack['id'],
+            'zip_path': zip_path,
+            'zip_filename': os.path.basename(zip_path),
+            'project_structure': project_structure,
+            'stats': dict(stats, build_ms=round((time.perf_counter() - start) * 1000, 2))
+        }
+
+    def _counted(self, files, stats):
+        """Pass (path, bytes) pairs through while tallying files, bytes and declared dependencies"""
+        for path, data in files:
+            stats['files'] += 1
+            stats['bytes'] += len(data)
+            stats['dependencies'] += count_dependencies(path, data)
+            yield path, data
+
+    def _reported(self, files, progress, technology):
+        """Pass (path, bytes) pairs through while reporting generation progress"""
+        count = 0
+        for path, data in files:
+            count += 1
+            progress('generate', 'progress', technology=technology, files=count)
+            yield path, data
+        progress('generate', 'finished', technology=technology, files=count)
+        progress('zip', 'started', technology=technology)
+
+    def stream_artifact(self, concepts, project_name, technology, archive_format='zip'):
+        """Yield a project's archive as byte chunks, generating each file as the client reads it
+
+        Nothing is stored. Files are validated before they are sent; an invalid file raises
+        ValueError mid-stream, which leaves the client with a truncated, unusable archive.
+        """
+        stack = stacks.resolve(technology)
+        metadata = self._artifact_metadata(stack['module'], project_name, concepts)
+        
+        def checked_files():
+            for path, data in self.iter_project_files(concepts, project_name, stack['id']):
+                error = file_validator.check(path, data)
+                if error:
+                    raise ValueError(f"Generated file failed validation: {path}: {error}")
+                yield path, data
+        
+        if archive_format != 'zip':
+            return stream_tar(checked_files(), archive_format)
+        return stream_zip(checked_files(), json.dumps(metadata, separators=(',', ':')).encode('utf-8'))
+
+    def _validated(self, files, checks):
+        """Pass (path, bytes) pairs through while submitting each one for validation"""
+        for path, data in files:
+            checks.append((path, file_validator.submit(path, data)))
+            yield path, data
+
+    def _validation_error(self, technology, invalid):
+        details = '; '.join(f"{path}: {error}" for path, error in invalid)
+        return {
+            'technology': technology,
+            'error': f"Generated files failed validation: {details}",
+            'validation_errors': [{'path': path, 'error': error} for path, error in invalid]
+        }
+
+    def _catalogued(self, files, entries, store=None):
+        """Pass (path, bytes) pairs through while recording (path, hash, size) entries
+
+        With a blob store, each body is also put into the store under that hash.
+        """
+        for path, data in files:
+            digest = store.put(data) if store is not None else hashlib.sha256(data).hexdigest()
+            entries.append((path, digest, len(data)))
+            yield path, data
+
+    def build_artifacts(self, concepts, project_name, technologies, output_dir, max_workers=None, store=None,
+                        archive_format='zip', progress=None, artifact_prefix=None):
+        """Generate and zip several stacks from one analysis, one ZIP per stack
+
+        Archives are named <artifact_prefix>-<stack>, the prefix defaulting to the project name.
+        With `max_workers` (default FANOUT_WORKERS) above 1 the stacks are built on a thread pool,
+        otherwise one after another in the calling thread.
+        """
+        # Several names may resolve to the same stack; build each stack only once
+        selected = []
+        for technology in technologies:
+            stack = stacks.resolve(technology)
+            if stack not in selected:
+                selected.append(stack)
+        
+        # Templates shared between stacks (React frontend, README) are rendered once
+        rendered = {}
+        def build(stack):
+            return self.build_artifact(concepts, project_name, stack['id'], output_dir,
+                                       f"{artifact_prefix or project_name}-{stack['module']}", rendered, store,
+                                       archive_format, progress)
+
+        workers = min(max_workers or FANOUT_WORKERS, len(selected), 8)
+        if workers <= 1:
+            return [build(stack) for stack in selected]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(build, selected))
+
+    def regenerate_artifact(self, zip_path, project_name=None, features=None, keywords=None, output_dir=None):
+        """Re-render only the files whose inputs changed and patch them into a copy of an existing ZIP
+
+        Unchanged members are copied over as their existing compressed bytes. The result keeps
+        the source's name with only the project name replaced, so paper-flask.zip renamed to
+        "notes" becomes notes-flask.zip; without a new name the source is updated in place.
+        An existing artifact other than the source is never overwritten.
+        """
+        try:
+            if not zipfile.is_zipfile(zip_path):
+                return {'error': 'Only ZIP artifacts can be regenerated; generate the project as a ZIP first'}
+            metadata = read_artifact_metadata(zip_path)
+            if metadata is None:
+                return {'error': 'Artifact has no generation metadata; generate it again from the PDF'}
+            
+            stack = metadata['stack']
+            old_concepts = metadata['concepts']
+            new_concepts = {
+                'features': list(features) if features is not None else old_concepts['features'],
+                'keywords': list(keywords)[:10] if keywords is not None else old_concepts['keywords']
+            }
+            new_project_name = project_name or metadata['project_name']
+            old_context, _ = self._project_templates(stack, old_concepts, metadata['project_name'])
+            new_context, templates = self._project_templates(stack, new_concepts, new_project_name)
+            changed = {slot for slot, value in new_context.items() if old_context.get(slot) != value}
+            
+            technology = new_context['technology']
+            new_metadata = self._artifact_metadata(stack, new_project_name, new_concepts)
+            new_zip_path = os.path.join(output_dir or os.path.dirname(zip_path),
+                                        f"{regenerated_name(zip_path, metadata, new_project_name)}.zip")
+            if os.path.exists(new_zip_path) and not os.path.samefile(new_zip_path, zip_path):
+                return {'error': f"{os.path.basename(new_zip_path)} already exists; choose another project name "
+                                 f"or regenerate that artifact instead", 'conflict': True}
+            
+            # Reused files keep the hashes recorded for the source, when it has a manifest
+            old_manifest = read_artifact_manifest(zip_path)
+            old_hashes = {entry['path']: entry['hash'] for entry in old_manifest['files']} if old_manifest else {}
+            
+            rerendered = []
+            checks = []
+            entries = []
+            with open(zip_path, 'rb') as source_file, publish(new_zip_path) as partial_path:
+                source_archive = zipfile.ZipFile(source_file)
+                source_members = {info.filename: info for info in source_archive.infolist()}
+                with ZipArchiveSink(partial_path, json.dumps(new_metadata, separators=(',', ':')).encode('utf-8')) as sink:
+                    for path, template in templates:
+                        old_dependencies = metadata['dependencies'].get(path)
+                        # Files switched on by a newly detected feature are simply missing from the source
+                        reusable = (path in source_members and old_dependencies == sorted(template.slots)
+                                    and not changed.intersection(old_dependencies))
+                        if reusable:
+                            info = source_members[path]
+                            digest = old_hashes.get(path) or hashlib.sha256(source_archive.read(info)).hexdigest()
+                            entries.append((path, digest, info.file_size))
+                            sink.write_member(read_raw_member(source_file, info))
+                        else:
+                            data = template.render_bytes(new_context)
+                            checks.append((path, file_validator.submit(path, data)))
+                            entries.append((path, hashlib.sha256(data).hexdigest(), len(data)))
+                            sink.write(path, data)
+                            rerendered.append(path)
+                invalid = [(path, future.result()) for path, future in checks if future.result()]
+                if invalid:
+                    raise InvalidFiles(invalid)
+                with open(partial_path, 'rb') as f:
+                    manifest = artifact_manifest(partial_path, f.read(), entries)
+            write_artifact_manifest(new_zip_path, manifest)
+            
+            return {
+                'technology': technology,
+                'zip_path': new_zip_path,
+                'zip_filename': os.path.basename(new_zip_path),
+                'project_structure': sink.names,
+                'changed_inputs': sorted(changed),
+                'rerendered': rerendered,
+                'reused': len(sink.names) - len(rerendered)
+            }
+        except InvalidFiles as e:
+            return self._validation_error(metadata['stack'], e.invalid)
+        except Exception as e:
+            return {'error': f"Error regenerating ZIP file: {str(e)}"}
+
+
+def read_artifact_metadata(zip_path):
+    """Return the generation metadata stored in an artifact's ZIP comment, or None"""
+    with zipfile.ZipFile(zip_path) as archive:
+        comment = archive.comment
+    try:
+        metadata = json.loads(comment.decode('utf-8'))
+    except ValueError:
+        return None
+    if not isinstance(metadata, dict) or metadata.get('generator') != 'research-paper-agent':
+        return None
+    return metadata
+
+def _ignore_progress(stage, state, **details):
+    pass
+
+
+def artifact_manifest_path(archive_path):
+    return archive_path + MANIFEST_SUFFIX
+
+
+def artifact_manifest(archive_path, archive_bytes, entries):
+    """Describe a finished archive and the (path, hash, size) entries of its files
+
+    The archive's size and modification time are recorded so a reader can tell, with one
+    stat, whether the manifest still describes the file next to it.
+    """
+    stat = os.stat(archive_path)
+    readmes = [path for path, _, _ in entries if os.path.basename(path).lower() == 'readme.md']
+    return {
+        'archive': {
+            'sha256': hashlib.sha256(archive_bytes).hexdigest(),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        },
+        # The shallowest README is the project's own
+        'readme': min(readmes, key=lambda path: (path.count('/'), path)) if readmes else None,
+        'files': [{'path': path, 'hash': digest, 'size': size} for path, digest, size in entries]
+    }
+
+
+def write_artifact_manifest(archive_path, manifest):
+    """Publish the manifest sidecar of an archive, <archive>.manifest.json"""
+    with publish(artifact_manifest_path(archive_path)) as temp_path:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+
+
+def read_artifact_manifest(archive_path):
+    """Return the manifest sidecar of an archive, or None when it is missing or out of date
+
+    Previews and runs list an artifact's files from this one small read instead of
+    extracting and walking it.
+    """
+    try:
+        with open(artifact_manifest_path(archive_path), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        stat = os.stat(archive_path)
+    except (OSError, ValueError):
+        return None
+    archive = manifest.get('archive', {}) if isinstance(manifest, dict) else {}
+    if archive.get('size') != stat.st_size or archive.get('mtime_ns') != stat.st_mtime_ns:
+        return None
+    return manifest
+
+# Initialize the research paper agent
+research_agent = ResearchPaperAgent()
@@ -0,0 +1,29 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+# mkstemp creates files readable by the owner only; published files get the usual mode instead.
+# Read once at import: changing the umask to read it would race with other threads creating files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o644 & ~_UMASK
+
+
+@contextmanager
+def publish(path):
+    """Yield a unique temporary path next to `path`, then atomically rename it into place
+
+    Readers see either the previous file or the complete new one, never a partial write, and
+    of several concurrent writers the last to finish wins. If the block raises, the temporary
+    file is removed and `path` is left untouched.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.partial')
+    os.close(fd)
+    try:
+        yield temp_path
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
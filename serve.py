@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Production server for the Research Paper Agent web app
+Runs app.py under gunicorn with several worker processes, or under a threaded single-process
+server where gunicorn is not available (e.g. on Windows)
+"""
+
+import argparse
+import gc
+import importlib.util
+import os
+import signal
+import sys
+import threading
+
+
+def preload():
+    """Import the app and warm everything workers would otherwise each load on their own
+
+    Called once in the parent before workers are forked, so the compiled templates, stack
+    plugins, pdfminer and the ADK agent are shared copy-on-write instead of duplicated.
+    """
+    import app as web_app
+    import stacks
+    from template_registry import template_registry
+
+    template_registry.preload()
+    for stack in stacks.available_stacks():
+        stacks.load_plugin(stack['id'])
+    for module in ('pdfplumber', 'agent'):
+        try:
+            __import__(module)
+        except ImportError as e:
+            print(f"Not preloading {module}: {e}")
+    # Keep the preloaded objects out of the cyclic GC, whose bookkeeping writes would
+    # otherwise copy their pages into every worker
+    gc.freeze()
+    return web_app
+
+
+def serve_gunicorn(options):
+    from gunicorn.app.base import BaseApplication
+
+    web_app = preload()
+
+    def retire_worker():
+        """Have gunicorn replace this worker as soon as it has no job queued or running"""
+        def wait_and_exit():
+            web_app.job_queue.wait_idle()
+            print(f"Worker {os.getpid()} reached its job limit; restarting")
+            os.kill(os.getpid(), signal.SIGTERM)
+        threading.Thread(target=wait_and_exit, daemon=True).start()
+
+    def post_worker_init(worker):
+        # Threads do not survive the fork, so each worker starts its own; one of them collects
+        web_app.start_collector()
+        if options.max_jobs:
+            web_app.job_queue.retire_after(options.max_jobs, retire_worker)
+
+    def worker_exit(server, worker):
+        # Graceful drain: requests are done, now finish the accepted jobs
+        web_app.job_queue.drain()
+
+    class Server(BaseApplication):
+        def load_config(self):
+            settings = {
+                'bind': options.bind,
+                'workers': options.workers,
+                'threads': options.threads,
+                # gthread keeps long requests (SSE progress streams) from blocking a worker
+                'worker_class': 'gthread',
+                'preload_app': True,
+                'max_requests': options.max_requests,
+                'max_requests_jitter': options.max_requests // 10,
+                # A stopping worker finishes its accepted jobs before exiting, so both limits
+                # must cover the longest upload
+                'timeout': options.timeout,
+                'graceful_timeout': options.graceful_timeout,
+                'post_worker_init': post_worker_init,
+                'worker_exit': worker_exit,
+            }
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return web_app.app
+
+    Server().run()
+
+
+def serve_threaded(options):
+    from werkzeug.serving import run_simple
+
+    web_app = preload()
+    web_app.start_collector()
+
+    # SIGTERM stops the server like Ctrl+C; accepted jobs are finished before the process ends
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    host, _, port = options.bind.rpartition(':')
+    print(f"gunicorn is not installed; serving from a single threaded process on {options.bind}")
+    try:
+        run_simple(host or '0.0.0.0', int(port), web_app.app, threaded=True, use_reloader=False, use_debugger=False)
+    finally:
+        web_app.job_queue.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bind', default=os.environ.get('SERVE_BIND', '0.0.0.0:8080'))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SERVE_WORKERS', 0)) or os.cpu_count() or 1,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('SERVE_THREADS', 8)),
+                        help='request threads per worker')
+    parser.add_argument('--max-jobs', type=int, default=int(os.environ.get('SERVE_MAX_JOBS', 100)),
+                        help='recycle a worker after starting this many upload jobs (0: never)')
+    parser.add_argument('--max-requests', type=int, default=int(os.environ.get('SERVE_MAX_REQUESTS', 5000)),
+                        help='recycle a worker after this many requests (0: never)')
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('SERVE_TIMEOUT', 300)))
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.environ.get('SERVE_GRACEFUL_TIMEOUT', 300)),
+                        help='seconds a worker gets to drain after SIGTERM')
+    options = parser.parse_args()
+
+    if importlib.util.find_spec('gunicorn') is not None:
+        serve_gunicorn(options)
+    else:
+        serve_threaded(options)
+
+
+if __name__ == "__main__":
+    main()
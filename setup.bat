@@ -20,7 +20,7 @@ if not exist uploads mkdir uploads
 echo ✅ Setup complete!
 echo.
 echo 🎯 To start the application:
-echo    python app.py
+echo    python serve.py
 echo.
 echo 🌐 The application will be available at:
 echo    Web Interface: http://localhost:5000
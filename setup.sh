@@ -21,7 +21,7 @@ mkdir -p uploads
 echo "✅ Setup complete!"
 echo ""
 echo "🎯 To start the application:"
-echo "   python3 app.py"
+echo "   python3 serve.py"
 echo ""
 echo "🌐 The application will be available at:"
 echo "   Web Interface: http://localhost:5000"
@@ -0,0 +1,61 @@
+import os
+import importlib
+import threading
+
+# Every stack the generator knows about. Plugins live in stacks/<module>.py and are
+# only imported the first time their technology is requested.
+STACKS = [
+    {'id': 'MERN Stack', 'name': 'MERN Stack', 'description': 'MongoDB, Express.js, React.js, Node.js', 'module': 'mern'},
+    {'id': 'MEAN Stack', 'name': 'MEAN Stack', 'description': 'MongoDB, Express.js, Angular, Node.js', 'module': 'mean'},
+    {'id': 'LAMP Stack', 'name': 'LAMP Stack', 'description': 'Linux, Apache, MySQL, PHP', 'module': 'lamp'},
+    {'id': 'Django Stack', 'name': 'Django Stack', 'description': 'Python, Django, PostgreSQL, React', 'module': 'django'},
+    {'id': 'Spring Boot Stack', 'name': 'Spring Boot Stack', 'description': 'Java, Spring Boot, MySQL, React', 'module': 'spring_boot'},
+    {'id': 'Laravel Stack', 'name': 'Laravel Stack', 'description': 'PHP, Laravel, MySQL, Vue.js', 'module': 'laravel'},
+    {'id': 'Flask Stack', 'name': 'Flask Stack', 'description': 'Python, Flask, SQLite, React', 'module': 'flask'},
+    {'id': 'Ruby on Rails Stack', 'name': 'Ruby on Rails Stack', 'description': 'Ruby, Rails, PostgreSQL, React', 'module': 'rails'}
+]
+
+# A deployment can restrict the offered stacks, e.g. ENABLED_STACKS="MERN Stack,Flask Stack"
+_enabled = os.environ.get('ENABLED_STACKS')
+ENABLED_STACKS = [stack for stack in STACKS
+                  if not _enabled or stack['id'] in [name.strip() for name in _enabled.split(',')]]
+
+DEFAULT_STACK = 'MERN Stack'
+
+_by_id = {stack['id']: stack for stack in ENABLED_STACKS}
+_plugins = {}
+_lock = threading.Lock()
+
+
+def available_stacks():
+    """Describe the enabled stacks for /api/technologies"""
+    return [{'id': stack['id'], 'name': stack['name'], 'description': stack['description']}
+            for stack in ENABLED_STACKS]
+
+
+def resolve(technology):
+    """Return the registry entry for a technology, falling back to the default stack"""
+    stack = _by_id.get(technology) or _by_id.get(DEFAULT_STACK)
+    return stack or ENABLED_STACKS[0]
+
+
+def stack_key(technology):
+    """Return the plugin/template name of a technology, e.g. 'flask' for 'Flask Stack'"""
+    return resolve(technology)['module']
+
+
+def load_plugin(technology):
+    """Import (once) and return the generator plugin module for a technology"""
+    module = stack_key(technology)
+    plugin = _plugins.get(module)
+    if plugin is None:
+        with _lock:
+            plugin = _plugins.get(module)
+            if plugin is None:
+                plugin = importlib.import_module(f'{__name__}.{module}')
+                _plugins[module] = plugin
+    return plugin
+
+
+def loaded_plugins():
+    return sorted(_plugins)
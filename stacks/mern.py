@@ -0,0 +1,13 @@
+from template_registry import template_registry
+
+STACK = 'mern'
+
+
+def generate(concepts, project_name, rendered=None):
+    """Generate MERN stack code"""
+    return template_registry.render_stack(STACK, concepts, project_name, rendered)
+
+
+def iter_files(concepts, project_name, rendered=None):
+    """Yield (path, bytes) for each generated file without building the whole file map"""
+    return template_registry.iter_stack(STACK, concepts, project_name, rendered)
@@ -0,0 +1,259 @@
+import os
+import re
+import json
+import marshal
+import threading
+from archive import PrecompressedBytes
+
+TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stack_templates')
+
+# Variable slots look like @@project_name@@ so they never collide with JSX/Angular/Blade braces
+SLOT_PATTERN = re.compile(r'@@(\w+)@@')
+
+
+class CompiledTemplate:
+    """A text template pre-parsed into literal chunks and variable slots"""
+
+    def __init__(self, name, source):
+        self.name = name
+        chunks = []
+        slot_positions = []
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            chunks.append(source[position:match.start()])
+            slot_positions.append((len(chunks), match.group(1)))
+            chunks.append('')
+            position = match.end()
+        chunks.append(source[position:])
+        self.chunks = tuple(chunks)
+        self.slot_positions = tuple(slot_positions)
+        self.slots = frozenset(slot for _, slot in slot_positions)
+        # Templates without slots render to the same string every time, so they are
+        # encoded and deflated once here rather than on every request
+        self.static = source if not self.slots else None
+        self.static_bytes = PrecompressedBytes(source.encode('utf-8')) if not self.slots else None
+
+    def render(self, context):
+        if self.static is not None:
+            return self.static
+        chunks = list(self.chunks)
+        for index, slot in self.slot_positions:
+            chunks[index] = context[slot]
+        return ''.join(chunks)
+
+    def render_bytes(self, context):
+        if self.static_bytes is not None:
+            return self.static_bytes
+        return self.render(context).encode('utf-8')
+
+
+class JsonTemplate:
+    """A JSON template whose string leaves may hold slots; renders to a fresh dict"""
+
+    def __init__(self, name, source):
+        self.name = name
+        data = json.loads(source)
+        self.slot_paths = tuple(self._find_slots(data, ()))
+        self.slots = frozenset(slot for _, template in self.slot_paths for slot in template.slots)
+        # marshal is the cheapest way to get a fresh deep copy of plain JSON data
+        self.skeleton = marshal.dumps(data)
+        self.static_bytes = PrecompressedBytes(encode_content(data)) if not self.slots else None
+
+    def _find_slots(self, value, path):
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        else:
+            if isinstance(value, str) and SLOT_PATTERN.search(value):
+                yield path, CompiledTemplate(self.name, value)
+            return
+        for key, item in items:
+            yield from self._find_slots(item, path + (key,))
+
+    def render(self, context):
+        data = marshal.loads(self.skeleton)
+        for path, template in self.slot_paths:
+            parent = data
+            for key in path[:-1]:
+                parent = parent[key]
+            parent[path[-1]] = template.render(context)
+        return data
+
+    def render_bytes(self, context):
+        if self.static_bytes is not None:
+            return self.static_bytes
+        return encode_content(self.render(context))
+
+
+class PrunedJsonTemplate:
+    """A JSON manifest template with the dependencies of disabled modules removed"""
+
+    SECTIONS = ('dependencies', 'devDependencies', 'require', 'require-dev')
+
+    def __init__(self, template, names):
+        self.template = template
+        self.names = tuple(names)
+        self.name = f"{template.name}?without={','.join(self.names)}"
+        # Which modules are on decides which entries survive
+        self.slots = template.slots | {'modules'}
+
+    def render(self, context):
+        data = self.template.render(context)
+        for section in self.SECTIONS:
+            for name in self.names:
+                data.get(section, {}).pop(name, None)
+        return data
+
+    def render_bytes(self, context):
+        return encode_content(self.render(context))
+
+
+class TemplateRegistry:
+    """Loads stack templates from disk once and keeps their compiled render plans"""
+
+    def __init__(self, root=TEMPLATE_ROOT):
+        self.root = root
+        self._templates = {}
+        self._manifests = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Return the compiled template for a name relative to the template root"""
+        template = self._templates.get(name)
+        if template is None:
+            with self._lock:
+                template = self._templates.get(name)
+                if template is None:
+                    with open(os.path.join(self.root, name), 'r', encoding='utf-8', newline='') as f:
+                        source = f.read()
+                    if name.endswith('.json.tmpl'):
+                        template = JsonTemplate(name, source)
+                    else:
+                        template = CompiledTemplate(name, source)
+                    self._templates[name] = template
+        return template
+
+    def manifest(self, stack):
+        """Return the manifest of a stack, loading and compiling its templates on first use"""
+        manifest = self._manifests.get(stack)
+        if manifest is None:
+            with open(os.path.join(self.root, stack, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            manifest['templates'] = tuple((path, self.get(name)) for path, name in manifest['files'].items())
+            with self._lock:
+                manifest = self._manifests.setdefault(stack, manifest)
+        return manifest
+
+    def stacks(self):
+        """List the stack directories that ship a manifest"""
+        return sorted(
+            entry for entry in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, entry, 'manifest.json'))
+        )
+
+    def preload(self, stacks=None):
+        """Compile every template of the given stacks (all stacks by default)"""
+        for stack in stacks or self.stacks():
+            self.manifest(stack)
+
+    def render(self, name, context):
+        return self.get(name).render(context)
+
+    def render_bytes(self, name, context):
+        """Render a template to archive bytes; static templates come back pre-compressed"""
+        return self.get(name).render_bytes(context)
+
+    def plan(self, stack, concepts, project_name):
+        """Work out the render context and the (path, template) pairs a paper needs
+
+        Manifest `modules` are switched on by the detected features. Files of modules that
+        are off are left out, their dependencies are pruned from the JSON manifests listed
+        under `dependencies`, and their fragments fall back to the `fallback` text. Pairs come
+        sorted by path, so files can be archived in a stable order as they are rendered.
+        """
+        manifest = self.manifest(stack)
+        context = build_context(concepts, project_name)
+        context['technology'] = manifest['technology']
+        features = set(concepts.get('features', []))
+        included = []
+        excluded_files = set()
+        pruned = {}
+        for name, module in manifest.get('modules', {}).items():
+            enabled = not features.isdisjoint(module['features'])
+            fragments = module.get('fragments', {}) if enabled else module.get('fallback', {})
+            if enabled:
+                included.append(name)
+            else:
+                excluded_files.update(module.get('files', []))
+                for path, names in module.get('dependencies', {}).items():
+                    pruned.setdefault(path, []).extend(names)
+            for slot in set(module.get('fragments', {})) | set(module.get('fallback', {})):
+                context[slot] = context.get(slot, '') + fragments.get(slot, '')
+        context['modules'] = ','.join(included)
+
+        templates = []
+        for path, template in manifest['templates']:
+            if path in excluded_files:
+                continue
+            if path in pruned:
+                template = PrunedJsonTemplate(template, pruned[path])
+            templates.append((path, template))
+        return context, sorted(templates, key=lambda pair: pair[0])
+
+    def render_stack(self, stack, concepts, project_name, rendered=None):
+        """Render every file a paper needs from a stack into a {path: content} dict
+
+        When several stacks are generated together they can share a `rendered` dict, so a
+        template used by more than one stack (the React frontend, the README) is rendered
+        once per distinct set of slot values.
+        """
+        context, templates = self.plan(stack, concepts, project_name)
+        if rendered is None:
+            return {path: template.render(context) for path, template in templates}
+
+        files = {}
+        for path, template in templates:
+            if isinstance(template, (JsonTemplate, PrunedJsonTemplate)):
+                # Dicts are mutable, so every stack gets its own copy
+                files[path] = template.render(context)
+                continue
+            key = (template.name,) + tuple(context[slot] for slot in sorted(template.slots))
+            content = rendered.get(key)
+            if content is None:
+                content = rendered.setdefault(key, template.render(context))
+            files[path] = content
+        return files
+
+    def iter_stack(self, stack, concepts, project_name, rendered=None):
+        """Yield (path, bytes) for every file a paper needs from a stack, one file at a time, in path order"""
+        context, templates = self.plan(stack, concepts, project_name)
+        for path, template in templates:
+            if rendered is None or not template.slots or isinstance(template, (JsonTemplate, PrunedJsonTemplate)):
+                yield path, template.render_bytes(context)
+                continue
+            key = ('bytes', template.name) + tuple(context[slot] for slot in sorted(template.slots))
+            data = rendered.get(key)
+            if data is None:
+                data = rendered.setdefault(key, template.render_bytes(context))
+            yield path, data
+
+
+def encode_content(content):
+    """Serialise a rendered file (text or JSON dict) to the bytes written into an archive"""
+    if isinstance(content, dict):
+        return json.dumps(content, indent=2).encode('utf-8')
+    return content.encode('utf-8')
+
+
+def build_context(concepts, project_name):
+    """Compute the slot values that the stack templates substitute"""
+    return {
+        'project_name': project_name,
+        'project_title': project_name.title(),
+        'features_list': '\n'.join(f"- {feature}" for feature in concepts.get('features', [])),
+        'keywords_list': '\n'.join(f"- {keyword}" for keyword in concepts.get('keywords', [])[:10]),
+    }
+
+
+template_registry = TemplateRegistry()
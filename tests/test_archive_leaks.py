@@ -0,0 +1,48 @@
+"""Repeated artifact builds must not leave temporary files or open file descriptors behind"""
+import io
+import os
+import tempfile
+
+import pytest
+
+from paper_agent import PipelineContext, research_agent
+
+GENERATIONS = 1000
+CONCEPTS = {
+    'keywords': ['Faculty', 'Evaluation', 'Research', 'System', 'Dashboard'],
+    'technical_terms': ['user', 'database', 'dashboard', 'authentication'],
+    'features': ['User Management', 'Authentication System', 'Dashboard'],
+    'content_length': 42000
+}
+FD_DIR = '/proc/self/fd'
+
+
+def build(index, output_dir):
+    concepts = dict(CONCEPTS, keywords=CONCEPTS['keywords'] + [f"k{index}"])
+    context = PipelineContext('leak-check', generated_code=research_agent.generate_mern_code(concepts, f"leak-{index}"))
+    zip_path = research_agent.create_zip_file(context, output_dir)
+    assert not zip_path.startswith('Error'), zip_path
+    research_agent.write_project_zip(io.BytesIO(), context.generated_code)
+
+
+def test_builds_leave_no_temporary_files(tmp_path, monkeypatch):
+    # A private temp directory, so files other processes put in /tmp cannot fail the test
+    temp_root = tmp_path / 'tmp'
+    output_dir = tmp_path / 'out'
+    temp_root.mkdir()
+    output_dir.mkdir()
+    monkeypatch.setattr(tempfile, 'tempdir', str(temp_root))
+    for index in range(GENERATIONS):
+        build(index, str(output_dir))
+    assert os.listdir(temp_root) == []
+    assert sorted(os.listdir(output_dir)) == ['leak-check.zip']
+
+
+@pytest.mark.skipif(not os.path.isdir(FD_DIR), reason="needs /proc/self/fd")
+def test_builds_leave_no_open_files(tmp_path):
+    # The first build opens whatever is loaded lazily (templates, caches); count from after it
+    build(0, str(tmp_path))
+    fds_before = len(os.listdir(FD_DIR))
+    for index in range(1, GENERATIONS):
+        build(index, str(tmp_path))
+    assert len(os.listdir(FD_DIR)) == fds_before
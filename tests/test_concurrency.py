@@ -0,0 +1,81 @@
+"""Pipeline runs sharing the one agent from many threads must never see each other's state"""
+import io
+import threading
+
+from paper_agent import research_agent
+from generation_cache import generation_cache
+
+WORKERS = 8
+ROUNDS = 5
+
+
+def paper(worker, round_number):
+    # A capitalised word of its own makes every run's keywords, and so its code, distinct
+    return f"Paper{chr(97 + worker)}{chr(97 + round_number)} user dashboard with analytics. Authentication for admin users."
+
+
+def expected_zip(content, project_name="research-app"):
+    context = research_agent.run_pipeline(content=content, project_name=project_name)
+    expected = io.BytesIO()
+    research_agent.write_project_zip(expected, context.generated_code)
+    return expected.getvalue()
+
+
+def run_in_threads(target):
+    barrier = threading.Barrier(WORKERS)
+    errors = []
+
+    def run(worker):
+        barrier.wait()
+        try:
+            target(worker)
+        except Exception as e:
+            errors.append(e)
+
+    generation_cache.clear()
+    threads = [threading.Thread(target=run, args=(worker,)) for worker in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    generation_cache.clear()
+    assert errors == []
+
+
+def test_parallel_runs_match_sequential_runs(tmp_path):
+    runs = {}
+
+    def target(worker):
+        for round_number in range(ROUNDS):
+            project_name = f"app-{worker}-{round_number}"
+            context = research_agent.run_pipeline(content=paper(worker, round_number), project_name=project_name)
+            assert context.error is None
+            runs[(worker, round_number)] = research_agent.create_zip_file(context, str(tmp_path))
+
+    run_in_threads(target)
+    assert len(runs) == WORKERS * ROUNDS
+    for (worker, round_number), zip_path in sorted(runs.items()):
+        with open(zip_path, 'rb') as f:
+            assert f.read() == expected_zip(paper(worker, round_number), f"app-{worker}-{round_number}"), zip_path
+
+
+def test_runs_sharing_the_default_name_keep_their_own_archives(tmp_path):
+    runs = {}
+
+    def target(worker):
+        context = research_agent.run_pipeline(content=paper(worker, 0))
+        assert context.project_name == "research-app"
+        runs[worker] = research_agent.create_zip_file(context, str(tmp_path))
+
+    run_in_threads(target)
+    assert len(set(runs.values())) == WORKERS
+    for worker, zip_path in runs.items():
+        with open(zip_path, 'rb') as f:
+            assert f.read() == expected_zip(paper(worker, 0)), zip_path
+
+
+def test_artifact_name_depends_on_paper_and_stack():
+    mern = research_agent.run_pipeline(content=paper(0, 0))
+    assert mern.artifact_name == f"research-app-{mern.source_sha256[:12]}-mern"
+    assert research_agent.run_pipeline(content=paper(1, 0)).artifact_name != mern.artifact_name
+    assert research_agent.run_pipeline("unused.pdf", "Flask Stack", content=paper(0, 0)).artifact_name != mern.artifact_name
@@ -0,0 +1,35 @@
+"""The same paper must build the same archive bytes in every process, whatever its hash seed"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUILD = """
+import hashlib, io, sys
+import stacks
+from paper_agent import research_agent
+content = ("Faculty Evaluation Research System Performance Appraisal Institution Academic Web Student "
+           "Analysis Grading Course Teaching Review Survey Metrics Ranking Feedback Portal Score Module. "
+           "A user dashboard with analytics and reporting. Authentication and login for admin users, "
+           "a database and an API for management of the system.")
+for stack in stacks.available_stacks():
+    context = research_agent.run_pipeline(content=content, technology=stack['id'])
+    archive = io.BytesIO()
+    research_agent.write_project_zip(archive, context.generated_code)
+    print(stack['id'], hashlib.sha256(archive.getvalue()).hexdigest())
+"""
+
+
+def build(hash_seed):
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    result = subprocess.run([sys.executable, '-c', BUILD], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def test_archives_do_not_depend_on_the_hash_seed():
+    first = build(1)
+    assert first.count('\n') >= 2
+    assert build(2) == first
+    assert build(3) == first
@@ -0,0 +1,66 @@
+"""Job state shared between server processes through the state directory"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import jobs
+from jobs import Job, JobQueue
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def write_state(state_dir, job, **changes):
+    path = os.path.join(state_dir, f"{job.id}.json")
+    data = dict(job._snapshot(), **changes)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return path
+
+
+def test_job_of_an_exited_process_is_failed(tmp_path):
+    job = Job('upload', ('paper.pdf',))
+    job.events.append({'stage': 'extract', 'state': 'started', 'seq': 0, 'elapsed_ms': 1.0})
+    path = write_state(str(tmp_path), job, status='running', pid=dead_pid())
+
+    loaded = Job.load(path)
+    assert loaded.status == 'failed'
+    assert loaded.finished_at is not None
+    assert loaded.events[-1]['stage'] == 'job' and loaded.events[-1]['state'] == 'failed'
+    # Saved as failed, so every process agrees
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f)['status'] == 'failed'
+
+
+def test_job_of_a_live_process_keeps_running(tmp_path):
+    job = Job('upload', ('paper.pdf',))
+    path = write_state(str(tmp_path), job, status='running')
+    assert Job.load(path).status == 'running'
+
+
+def test_any_process_trims_old_finished_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, 'TRIM_INTERVAL', 0)
+    queue = JobQueue(state_dir=str(tmp_path), max_age=3600)
+    old = time.time() - 7200
+
+    finished = Job('upload', ('a.pdf',))
+    finished_path = write_state(str(tmp_path), finished, status='succeeded', finished_at=old, pid=dead_pid())
+    abandoned = Job('upload', ('b.pdf',))
+    abandoned_path = write_state(str(tmp_path), abandoned, status='running', pid=dead_pid())
+    running = Job('upload', ('c.pdf',))
+    running_path = write_state(str(tmp_path), running, status='running')
+    recent = Job('upload', ('d.pdf',))
+    recent_path = write_state(str(tmp_path), recent, status='succeeded', finished_at=time.time(), pid=dead_pid())
+    for path in (finished_path, abandoned_path, running_path):
+        os.utime(path, (old, old))
+
+    stored = {job.id: job for job in queue.stored()}
+    assert not os.path.exists(finished_path)
+    assert not os.path.exists(abandoned_path)
+    assert stored[running.id].status == 'running'
+    assert stored[recent.id].status == 'succeeded'
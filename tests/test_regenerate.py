@@ -0,0 +1,48 @@
+"""Regenerating an artifact must write the same kind of artifact and never replace another one"""
+import os
+
+from paper_agent import read_artifact_metadata, research_agent
+
+CONCEPTS = {
+    'keywords': ['Faculty', 'Evaluation', 'Research', 'System', 'Dashboard'],
+    'technical_terms': ['user', 'database', 'dashboard', 'authentication'],
+    'features': ['User Management', 'Authentication System', 'Dashboard'],
+    'content_length': 42000
+}
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def build(output_dir):
+    """A single-stack paper.zip next to fan-out paper-mern.zip and paper-flask.zip"""
+    research_agent.build_artifact(CONCEPTS, 'paper', 'MERN Stack', output_dir)
+    research_agent.build_artifacts(CONCEPTS, 'paper', ['MERN Stack', 'Flask Stack'], output_dir)
+    return {name: read(os.path.join(output_dir, name)) for name in os.listdir(output_dir) if name.endswith('.zip')}
+
+
+def test_fanout_artifact_is_regenerated_in_place(tmp_path):
+    before = build(str(tmp_path))
+    result = research_agent.regenerate_artifact(str(tmp_path / 'paper-flask.zip'), features=['Dashboard'])
+    assert result['zip_filename'] == 'paper-flask.zip'
+    assert read_artifact_metadata(str(tmp_path / 'paper-flask.zip'))['stack'] == 'flask'
+    # The single-stack MERN artifact is untouched
+    assert read(str(tmp_path / 'paper.zip')) == before['paper.zip']
+    assert read_artifact_metadata(str(tmp_path / 'paper.zip'))['stack'] == 'mern'
+
+
+def test_renamed_fanout_artifact_keeps_its_stack_suffix(tmp_path):
+    build(str(tmp_path))
+    result = research_agent.regenerate_artifact(str(tmp_path / 'paper-flask.zip'), project_name='notes')
+    assert result['zip_filename'] == 'notes-flask.zip'
+    assert read_artifact_metadata(str(tmp_path / 'notes-flask.zip'))['project_name'] == 'notes'
+
+
+def test_existing_artifact_is_not_overwritten(tmp_path):
+    before = build(str(tmp_path))
+    os.rename(tmp_path / 'paper-mern.zip', tmp_path / 'notes-flask.zip')
+    result = research_agent.regenerate_artifact(str(tmp_path / 'paper-flask.zip'), project_name='notes')
+    assert result.get('conflict') is True
+    assert read(str(tmp_path / 'notes-flask.zip')) == before['paper-mern.zip']
@@ -0,0 +1,36 @@
+"""Which generated files the syntax checks cover"""
+import shutil
+
+import pytest
+
+from validation import FileValidator
+
+needs_node = pytest.mark.skipif(shutil.which('node') is None, reason="needs node")
+
+
+@needs_node
+def test_javascript_with_html_strings_is_checked():
+    validator = FileValidator(max_workers=2)
+    assert validator.check('public/js/app.js', b'list.innerHTML = "<li>" + item + "</li>";') is None
+    assert 'SyntaxError' in validator.check('public/js/app.js', b'list.innerHTML = "<li>" + ;')
+
+
+@needs_node
+def test_react_components_are_left_to_the_build():
+    validator = FileValidator(max_workers=2)
+    component = b"import React from 'react';\nconst App = () => <div className=\"app\" />;\nexport default App;\n"
+    assert validator.check('frontend/src/App.js', component) is None
+    assert validator.check('frontend/src/App.jsx', b'const App = () => <div />;') is None
+
+
+@needs_node
+def test_javascript_checks_run_on_several_node_processes():
+    validator = FileValidator(max_workers=3)
+    files = [(f"file{index}.js", f"const value{index} = ;".encode()) for index in range(12)]
+    assert len(validator.validate(files)) == 12
+    # While one process is busy with a check, another one takes the next
+    busy = validator.node._idle.get()
+    try:
+        assert 'SyntaxError' in validator.check('other.js', b'const other = ;')
+    finally:
+        validator.node._idle.put(busy)
@@ -0,0 +1,258 @@
+import os
+import io
+import re
+import json
+import time
+import uuid
+import hashlib
+import tempfile
+from blob_store import _write_atomic, file_digest, remove_tree
+
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# A stored file's extracted text is kept next to it, e.g. <sha256>.pdf.txt
+TEXT_SUFFIX = '.txt'
+
+
+class SpooledUpload:
+    """Writable file that receives one uploaded file and hashes it in the same pass
+
+    The first `spool_bytes` are kept in memory. A larger upload rolls over to a temporary
+    file in `directory`, which UploadStore.commit later renames into place, so its bytes are
+    only ever written once. Memory use is bounded by `spool_bytes` whatever the upload's size.
+
+    The hash is only known once the last byte is in, so a duplicate larger than `spool_bytes`
+    is still written to disk in full before UploadStore.commit recognises and drops it. Clients
+    that may resend large files should offer the hash first (POST /api/upload/by-hash), which
+    sends nothing for content that is already stored.
+    """
+
+    def __init__(self, directory, spool_bytes):
+        self.directory = directory
+        self.spool_bytes = spool_bytes
+        self.size = 0
+        self.temp_path = None
+        self._sha256 = hashlib.sha256()
+        self._file = io.BytesIO()
+
+    def write(self, data):
+        self._sha256.update(data)
+        self.size += len(data)
+        if self.temp_path is None and self.size > self.spool_bytes:
+            self._rollover()
+        return self._file.write(data)
+
+    def _rollover(self):
+        fd, self.temp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-', suffix='.partial')
+        spooled = self._file
+        self._file = os.fdopen(fd, 'w+b')
+        self._file.write(spooled.getbuffer())
+
+    def hexdigest(self):
+        return self._sha256.hexdigest()
+
+    # Werkzeug seeks back to the start once the upload is parsed; the rest keeps FileStorage usable
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def readline(self, size=-1):
+        return self._file.readline(size)
+
+    def seek(self, offset, whence=0):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def move_to(self, path):
+        """Put the upload at `path`: a rename once it is on disk, a single write while in memory"""
+        if self.temp_path is None:
+            _write_atomic(path, self._file.getbuffer())
+        else:
+            self._file.flush()
+            os.replace(self.temp_path, path)
+            self.temp_path = None
+
+    def close(self):
+        self._file.close()
+        if self.temp_path is not None and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+            self.temp_path = None
+
+
+class UploadStore:
+    """Keeps each distinct uploaded file once, as <root>/<sha256><extension>
+
+    Uploads are hashed while they are received (see spool), so an upload of content that is
+    already stored is recognised without writing it a second time.
+    """
+
+    def __init__(self, root, spool_bytes=16 * 1024 * 1024, extension='.pdf'):
+        self.root = root
+        self.spool_bytes = spool_bytes
+        self.extension = extension
+        os.makedirs(root, exist_ok=True)
+
+    def spool(self):
+        """Return a SpooledUpload to receive a new upload into"""
+        return SpooledUpload(self.root, self.spool_bytes)
+
+    def path(self, digest):
+        return os.path.join(self.root, f"{digest}{self.extension}")
+
+    def digest(self, path):
+        """The SHA-256 a stored file is named by"""
+        return os.path.basename(path)[:-len(self.extension)]
+
+    def find(self, digest):
+        """Return the path of stored content with this SHA-256, recording the use, or None"""
+        if not SHA256_PATTERN.match(digest):
+            return None
+        path = self.path(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def read_text(self, path):
+        """Return the text extracted from a stored file earlier, or None"""
+        try:
+            with open(path + TEXT_SUFFIX, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write_text(self, path, text):
+        """Keep the text extracted from a stored file, so the same content is never extracted twice"""
+        _write_atomic(path + TEXT_SUFFIX, text.encode('utf-8'))
+
+    def _store(self, digest, move_to):
+        path = self.path(digest)
+        try:
+            # Already stored: only record the use, so the garbage collector keeps it
+            os.utime(path)
+            return path, digest, True
+        except FileNotFoundError:
+            move_to(path)
+            return path, digest, False
+
+    def commit(self, upload):
+        """Store a fully received upload under its hash; returns (path, sha256, duplicate)"""
+        result = self._store(upload.hexdigest(), upload.move_to)
+        upload.close()
+        return result
+
+    def add(self, source_path, digest):
+        """Move a file whose hash is already known into the store; returns (path, sha256, duplicate)"""
+        result = self._store(digest, lambda path: os.replace(source_path, path))
+        if os.path.exists(source_path):
+            os.remove(source_path)
+        return result
+
+
+class ResumableUploads:
+    """Uploads sent as fixed-size chunks over several requests, so a failure only costs one chunk
+
+    Each upload is a directory <root>/<id> holding its metadata, a data file of the upload's
+    full size that chunks are written into at their offsets, and an empty marker per chunk
+    received in full. Chunks may arrive in any order, in parallel and through any server
+    process; the markers tell a client which ones it still has to send.
+    """
+
+    def __init__(self, root, chunk_bytes=4 * 1024 * 1024):
+        self.root = root
+        self.chunk_bytes = chunk_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, upload_id):
+        return os.path.join(self.root, upload_id)
+
+    def create(self, filename, size):
+        """Start an upload of `size` bytes and return its status"""
+        upload_id = uuid.uuid4().hex
+        directory = self._dir(upload_id)
+        os.makedirs(directory)
+        with open(os.path.join(directory, 'data'), 'wb') as f:
+            f.truncate(size)
+        metadata = {'id': upload_id, 'filename': filename, 'size': size, 'chunk_bytes': self.chunk_bytes,
+                    'created_at': time.time()}
+        _write_atomic(os.path.join(directory, 'upload.json'), json.dumps(metadata).encode('utf-8'))
+        return self.get(upload_id)
+
+    def get(self, upload_id):
+        """Return an upload's metadata plus which chunks are received, or None if there is no such upload
+
+        `offset` is where the received data stops being contiguous; `missing` lists the offset
+        of every chunk still to be sent.
+        """
+        if not UPLOAD_ID_PATTERN.match(upload_id):
+            return None
+        directory = self._dir(upload_id)
+        try:
+            with open(os.path.join(directory, 'upload.json'), 'r', encoding='utf-8') as f:
+                upload = json.load(f)
+            received = {int(name[:-len('.chunk')]) for name in os.listdir(directory) if name.endswith('.chunk')}
+        except (OSError, ValueError):
+            return None
+        chunk_bytes = upload['chunk_bytes']
+        offsets = range(0, upload['size'], chunk_bytes)
+        missing = [offset for offset in offsets if offset // chunk_bytes not in received]
+        upload['received_bytes'] = sum(min(chunk_bytes, upload['size'] - offset) for offset in offsets
+                                       if offset // chunk_bytes in received)
+        upload['offset'] = missing[0] if missing else upload['size']
+        upload['missing'] = missing
+        return upload
+
+    def write_chunk(self, upload, offset, stream, length, sha256=None):
+        """Write the chunk starting at `offset` from a stream of `length` bytes; returns the new status
+
+        Raises ValueError for a chunk that does not line up with the upload's chunks, that ends
+        before all its bytes arrived or, given its `sha256`, whose bytes hash differently. Such
+        a chunk is not marked as received. Sending a chunk again overwrites it.
+        """
+        size, chunk_bytes = upload['size'], upload['chunk_bytes']
+        if offset is None or offset < 0 or offset >= size or offset % chunk_bytes:
+            raise ValueError(f"Offset must be a multiple of {chunk_bytes} below {size}")
+        expected = min(chunk_bytes, size - offset)
+        if length != expected:
+            raise ValueError(f"Chunk at offset {offset} must be {expected} bytes, got {length}")
+        directory = self._dir(upload['id'])
+        written = 0
+        digest = hashlib.sha256()
+        with open(os.path.join(directory, 'data'), 'r+b') as f:
+            f.seek(offset)
+            while written < expected:
+                data = stream.read(min(1024 * 1024, expected - written))
+                if not data:
+                    break
+                f.write(data)
+                digest.update(data)
+                written += len(data)
+        if written != expected:
+            raise ValueError(f"Chunk at offset {offset} ended after {written} of {expected} bytes")
+        if sha256 and digest.hexdigest() != sha256.lower():
+            raise ValueError(f"Checksum mismatch: the chunk at offset {offset} hashes to {digest.hexdigest()}")
+        # Only a complete chunk is marked as received
+        open(os.path.join(directory, f"{offset // chunk_bytes}.chunk"), 'wb').close()
+        return self.get(upload['id'])
+
+    def complete(self, upload, sha256=None):
+        """Check that every chunk arrived and, given `sha256`, that the data hashes to it
+
+        Returns (data file path, sha256). Raises ValueError otherwise. A checksum mismatch
+        discards the upload, since there is no telling which chunk was wrong. Clients that do
+        not hash the whole file can send each chunk's hash to write_chunk instead.
+        """
+        if upload['missing']:
+            raise ValueError(f"{len(upload['missing'])} chunk(s) missing, starting at offset {upload['offset']}")
+        data_path = os.path.join(self._dir(upload['id']), 'data')
+        digest = file_digest(data_path)
+        if sha256 and digest != sha256.lower():
+            self.remove(upload['id'])
+            raise ValueError(f"Checksum mismatch: the uploaded data hashes to {digest}")
+        return data_path, digest
+
+    def remove(self, upload_id):
+        remove_tree(self._dir(upload_id))
@@ -0,0 +1,205 @@
+import os
+import re
+import json
+import queue
+import shutil
+import hashlib
+import tempfile
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from generation_cache import LRUCache
+
+# JSX only appears in React components: .jsx files, or .js files that import React
+REACT_IMPORT_PATTERN = re.compile(r'''^\s*import\b[^;]*?\bfrom\s+['"]react['"]''', re.MULTILINE)
+ESM_PATTERN = re.compile(r'^\s*(import|export)\b', re.MULTILINE)
+
+
+def _check_json(path, text):
+    try:
+        json.loads(text)
+    except ValueError as e:
+        return f"invalid JSON: {e}"
+
+
+def _check_python(path, text):
+    try:
+        compile(text, path, 'exec', dont_inherit=True)
+    except SyntaxError as e:
+        return f"Python syntax error at line {e.lineno}: {e.msg}"
+
+
+# Long-lived node process that syntax-checks one JSON request per line, so each check costs
+# a round trip instead of a node start-up
+NODE_CHECKER = r"""
+const vm = require('vm');
+const rl = require('readline').createInterface({ input: process.stdin });
+rl.on('line', (line) => {
+  const { source, module } = JSON.parse(line);
+  let error = null;
+  try {
+    if (module) new vm.SourceTextModule(source, { identifier: 'line' });
+    else vm.compileFunction(source, ['exports', 'require', 'module', '__filename', '__dirname'], { filename: 'line' });
+  } catch (e) {
+    const where = /^line:(\d+)/.exec(String(e.stack));
+    error = `${e.name}: ${e.message}` + (where ? ` (line ${where[1]})` : '');
+  }
+  process.stdout.write(JSON.stringify({ error }) + '\n');
+});
+"""
+
+
+class NodeSyntaxChecker:
+    """Parses JavaScript with up to `processes` persistent node child processes, one check each at a time
+
+    Processes are started on first use, so a pool larger than the load costs nothing.
+    """
+
+    def __init__(self, node, processes=1):
+        self.node = node
+        # Slots of the pool; None until that slot's process is started. Last in, first out, so
+        # the processes already running are reused first
+        self._idle = queue.LifoQueue()
+        for _ in range(max(processes, 1)):
+            self._idle.put(None)
+
+    def _start(self):
+        return subprocess.Popen(
+            [self.node, '--no-warnings', '--experimental-vm-modules', '-e', NODE_CHECKER],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8')
+
+    def check(self, text):
+        request = json.dumps({'source': text, 'module': bool(ESM_PATTERN.search(text))}) + '\n'
+        process = self._idle.get()
+        try:
+            # Start on first use, and again if node died since the last check
+            for _ in range(2):
+                if process is None or process.poll() is not None:
+                    process = self._start()
+                try:
+                    process.stdin.write(request)
+                    process.stdin.flush()
+                    response = process.stdout.readline()
+                except (OSError, ValueError):
+                    response = ''
+                if response:
+                    return json.loads(response)['error']
+                process = None
+            return None
+        finally:
+            self._idle.put(process)
+
+
+class TypeScriptSyntaxChecker:
+    """Parses TypeScript with esbuild or, failing that, tsc; one short-lived process per check
+
+    Only syntax is checked: imports are not resolved and types are not checked, since a
+    generated project's dependencies are not installed here.
+    """
+
+    def __init__(self, esbuild=None, tsc=None):
+        self.esbuild = esbuild
+        self.tsc = tsc
+
+    def check(self, text):
+        if self.esbuild is not None:
+            result = subprocess.run([self.esbuild, '--loader=ts', '--log-level=error'], input=text,
+                                    capture_output=True, text=True, encoding='utf-8')
+            if result.returncode == 0:
+                return None
+            errors = [line.strip() for line in result.stderr.splitlines() if 'ERROR' in line]
+            return (errors or [result.stderr.strip()])[0]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'check.ts')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            result = subprocess.run([self.tsc, '--noEmit', '--noResolve', '--skipLibCheck', '--experimentalDecorators',
+                                     '--target', 'es2020', path], capture_output=True, text=True, encoding='utf-8')
+        # Syntax errors are TS1xxx; the rest are about unresolved imports and types
+        errors = [line.split(': ', 1)[-1] for line in result.stdout.splitlines() if re.search(r'error TS1\d{3}:', line)]
+        return errors[0] if errors else None
+
+
+def _check_javascript(checker, path, text):
+    # node cannot parse JSX, so React components are left unchecked
+    if checker is None or path.lower().endswith('.jsx') or REACT_IMPORT_PATTERN.search(text):
+        return None
+    error = checker.check(text)
+    return f"JavaScript {error}" if error else None
+
+
+def _check_typescript(checker, path, text):
+    if checker is None:
+        return None
+    error = checker.check(text)
+    return f"TypeScript {error}" if error else None
+
+
+class FileValidator:
+    """Syntax-checks generated files by language, in parallel, caching verdicts by content hash
+
+    JSON is parsed, Python is compiled, JavaScript other than React components is parsed by
+    node and TypeScript by esbuild or tsc, each when installed. Other files are accepted as
+    they are. JavaScript checks go to up to `max_workers` node processes, so they run in
+    parallel like the rest.
+    """
+
+    def __init__(self, max_workers=None, cache_entries=4096):
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        node = shutil.which('node')
+        self.node = NodeSyntaxChecker(node, self.max_workers) if node else None
+        esbuild, tsc = shutil.which('esbuild'), shutil.which('tsc')
+        self.typescript = TypeScriptSyntaxChecker(esbuild, tsc) if esbuild or tsc else None
+        self._verdicts = LRUCache(cache_entries, 16 * 1024 * 1024)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _checker(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.json':
+            return _check_json
+        if extension == '.py':
+            return _check_python
+        if extension in ('.js', '.jsx', '.mjs', '.cjs'):
+            return lambda path, text: _check_javascript(self.node, path, text)
+        if extension == '.ts':
+            return lambda path, text: _check_typescript(self.typescript, path, text)
+        return None
+
+    def check(self, path, data):
+        """Return an error message for one file, or None when it is valid"""
+        checker = self._checker(path)
+        if checker is None:
+            return None
+        # Static templates hash to the same key on every request, so each is checked once
+        key = (os.path.splitext(path)[1].lower(), hashlib.sha256(data).hexdigest())
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            try:
+                error = checker(path, data.decode('utf-8'))
+            except UnicodeDecodeError:
+                error = 'not valid UTF-8'
+            verdict = (error,)
+            self._verdicts.put(key, verdict, 64 + len(error or ''))
+        return verdict[0]
+
+    def submit(self, path, data):
+        """Check a file on the worker pool and return a future for its error message"""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='validate')
+        return self._pool.submit(self.check, path, data)
+
+    def validate(self, files):
+        """Check (path, bytes) pairs in parallel and return [(path, error)] for the invalid ones"""
+        checks = [(path, self.submit(path, data)) for path, data in files]
+        return [(path, future.result()) for path, future in checks if future.result()]
+
+    def stats(self):
+        return dict(self._verdicts.stats(), node=self.node is not None, typescript=self.typescript is not None)
+
+
+file_validator = FileValidator(max_workers=int(os.environ.get('VALIDATION_WORKERS', 0)) or None)